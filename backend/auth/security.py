@@ -2,24 +2,54 @@
 Security module handling authentication, password hashing, and JWT token management.
 
 This module provides core security functions for user authentication including:
-- Password hashing and verification using bcrypt
-- JWT token creation and verification  
+- Password hashing and verification using bcrypt, run in a bounded thread
+  pool so the event loop keeps serving other requests meanwhile
+- JWT token creation and verification, with an in-process cache of
+  already-verified tokens
 - User authentication middleware
 - Session management via HTTP cookies
 """
-from bson import ObjectId
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import Request, HTTPException, Depends
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from typing import Optional
-from backend.db.mongo import db
+from typing import Optional, Tuple
+from backend.core.config import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_CONCURRENCY,
+    TOKEN_CACHE_MAX_ENTRIES,
+    TOKEN_CACHE_TTL_SECONDS,
+)
+from backend.services.user_cache import get_user
+from backend.utils.cache import TTLCache
 
 SECRET_KEY = "AI_PERSONAL_NEWS_SECRET"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with a cost other than BCRYPT_ROUNDS are flagged for rehashing
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so threads hash in parallel; the pool size caps how
+# many run at once and further calls queue
+_password_executor = ThreadPoolExecutor(
+    max_workers=max(1, PASSWORD_HASH_CONCURRENCY),
+    thread_name_prefix="bcrypt",
+)
+
+# Verified token payloads by SHA-256 of the token; hits/misses are counted by
+# TTLCache. Only valid tokens are cached, so garbage cookies cannot fill it.
+token_cache = TTLCache(maxsize=TOKEN_CACHE_MAX_ENTRIES, ttl=TOKEN_CACHE_TTL_SECONDS)
 
 def verify_password(plain_password, hashed_password):
     """
@@ -46,6 +76,37 @@ def get_password_hash(password):
     """
     return pwd_context.hash(password)
 
+async def hash_password(password: str) -> str:
+    """
+    Hash a password in the password thread pool.
+    
+    Args:
+        password (str): Plain text password to hash
+        
+    Returns:
+        str: Bcrypt hash with the configured cost (BCRYPT_ROUNDS)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password in the password thread pool, rehashing it if needed.
+    
+    Args:
+        plain_password (str): The plain text password to verify
+        hashed_password (str): The stored hash to compare against
+        
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and a new
+        hash to store when the stored one uses an outdated cost or scheme
+        (None otherwise)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
     Create a JWT access token with user data and expiration.
@@ -67,17 +128,33 @@ def verify_token(token: str) -> Optional[dict]:
     """
     Verify and decode a JWT token.
     
+    Tokens that were verified before are served from token_cache until their
+    `exp` claim (or TOKEN_CACHE_TTL_SECONDS, whichever comes first).
+    
     Args:
         token (str): JWT token string to verify and decode
         
     Returns:
         Optional[dict]: Decoded token payload if valid, None if invalid or expired
     """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
 
+    ttl = TOKEN_CACHE_TTL_SECONDS
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        token_cache.set(key, payload, ttl=ttl)
+    return dict(payload)
+
 async def get_current_user(request: Request):
     """
     Extract and validate current user from request authentication cookie.
@@ -86,14 +163,17 @@ async def get_current_user(request: Request):
         request (Request): FastAPI request object containing authentication cookie
         
     Returns:
-        dict: Complete user document from database or cached test user data
+        dict: User document (without password hash) from the user cache or
+              database, or cached test user data
         
     Raises:
         HTTPException: 401 for missing/invalid tokens, 400 for invalid user ID format,
                       404 for user not found in database
         
     Note:
-        Includes special handling for test user during development
+        Includes special handling for test user during development.
+        FastAPI caches this dependency per request, so routes should use the
+        returned document rather than loading the user again.
     """
     token = request.cookies.get("access_token")
     if not token:
@@ -121,6 +201,7 @@ async def get_current_user(request: Request):
             "created_at": "2025-07-22T13:52:05.138000",
             "article_count": 13,
             "preferred_language": "en",
+            "favorites_count": 1,
             "favorites": [
                 {
                     "url": "https://slickdeals.net/f/18468184-redragon-mechanical-wireless-keyboard-k556-se-rgb-34-61-k673-pro-75-35-82-k686-pro-se-98-keys-53-26-free-shipping",
@@ -132,7 +213,7 @@ async def get_current_user(request: Request):
         }
     else:
         try:
-            user = await db["users"].find_one({"_id": ObjectId(user_id)})
+            user = await get_user(user_id)
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid user ID format")
 
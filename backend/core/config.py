@@ -11,3 +11,160 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+# Upstream endpoints (overridable to point at local stubs, see benchmarks/bench_load.py)
+NEWS_API_URL = os.getenv("NEWS_API_URL", "https://newsdata.io/api/1/news")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+# Dashboard summarization pipeline
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", 5))
+SUMMARY_TIMEOUT_SECONDS = float(os.getenv("SUMMARY_TIMEOUT_SECONDS", 8))
+# Pack several articles into one JSON-mode LLM request
+SUMMARY_BATCHING = os.getenv("SUMMARY_BATCHING", "true").lower() == "true"
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", 8))
+SUMMARY_BATCH_TOKEN_BUDGET = int(os.getenv("SUMMARY_BATCH_TOKEN_BUDGET", 3000))
+SUMMARY_BATCH_TIMEOUT_SECONDS = float(os.getenv("SUMMARY_BATCH_TIMEOUT_SECONDS", 20))
+# Local extractive tier: articles whose text is at most LOCAL_SUMMARY_SENTENCES
+# sentences and LOCAL_SUMMARY_MAX_WORDS words are summarized locally, as are
+# all articles while OpenAI is unavailable or the LLM queue would take longer
+# than LOCAL_SUMMARY_MAX_LLM_WAIT_SECONDS
+LOCAL_SUMMARY_ENABLED = os.getenv("LOCAL_SUMMARY_ENABLED", "true").lower() == "true"
+LOCAL_SUMMARY_SENTENCES = int(os.getenv("LOCAL_SUMMARY_SENTENCES", 2))
+LOCAL_SUMMARY_MAX_WORDS = int(os.getenv("LOCAL_SUMMARY_MAX_WORDS", 60))
+LOCAL_SUMMARY_MAX_CHARS = int(os.getenv("LOCAL_SUMMARY_MAX_CHARS", 300))
+LOCAL_SUMMARY_MAX_LLM_WAIT_SECONDS = float(os.getenv("LOCAL_SUMMARY_MAX_LLM_WAIT_SECONDS", 2))
+# Stream headlines first and push each summary as it completes
+DASHBOARD_STREAMING = os.getenv("DASHBOARD_STREAMING", "true").lower() == "true"
+
+# Shared summary cache (Redis when available, in-process otherwise)
+OPENAI_SUMMARY_MODEL = os.getenv("OPENAI_SUMMARY_MODEL", "gpt-3.5-turbo")
+SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", 24 * 60 * 60))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", 5000))
+
+# NewsData.io response cache (stale-while-revalidate)
+NEWS_CACHE_TTL_SECONDS = int(os.getenv("NEWS_CACHE_TTL_SECONDS", 5 * 60))
+NEWS_CACHE_STALE_SECONDS = int(os.getenv("NEWS_CACHE_STALE_SECONDS", 30 * 60))
+# Older entries are still served when NewsData.io fails or its breaker is open
+NEWS_CACHE_FALLBACK_SECONDS = int(os.getenv("NEWS_CACHE_FALLBACK_SECONDS", 24 * 60 * 60))
+NEWS_CACHE_MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", 500))
+NEWS_FETCH_CONCURRENCY = int(os.getenv("NEWS_FETCH_CONCURRENCY", 4))
+
+# Near-duplicate clustering of feed articles before summarization
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", 0.5))
+# Stored articles read per requested article, so dropped duplicates can be replaced
+DEDUP_OVERFETCH = int(os.getenv("DEDUP_OVERFETCH", 2))
+
+# Personalized ranking: candidates read per shown article, recency half-life
+# and how many recent favorites feed the interest profile
+RANKING_ENABLED = os.getenv("RANKING_ENABLED", "true").lower() == "true"
+RANKING_CANDIDATE_FACTOR = int(os.getenv("RANKING_CANDIDATE_FACTOR", 4))
+RANKING_HALF_LIFE_HOURS = float(os.getenv("RANKING_HALF_LIFE_HOURS", 24))
+RANKING_FAVORITES_HISTORY = int(os.getenv("RANKING_FAVORITES_HISTORY", 50))
+
+# Materialized per-user feeds, refreshed on ingest for recently active users
+FEED_CACHE_ENABLED = os.getenv("FEED_CACHE_ENABLED", "true").lower() == "true"
+FEED_MAX_LENGTH = int(os.getenv("FEED_MAX_LENGTH", 50))
+FEED_TTL_SECONDS = int(os.getenv("FEED_TTL_SECONDS", 6 * 60 * 60))
+# With Redis, how long a worker reuses its local copy of a feed before
+# re-reading it (bounds how late other workers see rebuilds and invalidations)
+FEED_LOCAL_TTL_SECONDS = float(os.getenv("FEED_LOCAL_TTL_SECONDS", 15))
+FEED_CACHE_MAX_USERS = int(os.getenv("FEED_CACHE_MAX_USERS", 2000))
+FEED_ACTIVE_DAYS = int(os.getenv("FEED_ACTIVE_DAYS", 7))
+FEED_REFRESH_CONCURRENCY = int(os.getenv("FEED_REFRESH_CONCURRENCY", 4))
+# Feeds rebuilt per ingestion cycle (most recently active users first); the
+# other affected feeds are dropped and rebuilt on the user's next view
+FEED_REFRESH_MAX_USERS = int(os.getenv("FEED_REFRESH_MAX_USERS", 200))
+# The dashboard renders a small first page; the rest of the feed is fetched
+# (and summarized) a page of the user's article_count at a time on scroll
+DASHBOARD_FIRST_PAGE_SIZE = int(os.getenv("DASHBOARD_FIRST_PAGE_SIZE", 6))
+# Largest page_size accepted by /news/, and how deep its cursor pages go
+NEWS_MAX_PAGE_SIZE = int(os.getenv("NEWS_MAX_PAGE_SIZE", 50))
+NEWS_MAX_RESULTS = int(os.getenv("NEWS_MAX_RESULTS", 200))
+# How long /news/ reuses a user's de-duplicated, ranked store results across
+# its cursor pages before ranking them again
+NEWS_POOL_TTL_SECONDS = int(os.getenv("NEWS_POOL_TTL_SECONDS", 300))
+
+# Short-lived cache of user documents (invalidated on writes)
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+
+# Shared outbound HTTP connection pool (NewsData.io, OpenAI)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", 60))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", 10))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", 5))
+# Requires the optional h2 package (pip install "httpx[http2]")
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", 60))
+
+# LLM gateway: account rate limits and retry policy for OpenAI calls
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", 500))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", 60000))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", 0.5))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", 20))
+
+# Per-upstream circuit breakers: over the last UPSTREAM_BREAKER_WINDOW calls,
+# an error or slow-call share at or above the rates opens the breaker for
+# UPSTREAM_BREAKER_OPEN_SECONDS. Timeouts adapt to UPSTREAM_TIMEOUT_P95_MULTIPLIER
+# x the observed p95, between the *_TIMEOUT_MIN_SECONDS and the client timeout.
+UPSTREAM_BREAKER_WINDOW = int(os.getenv("UPSTREAM_BREAKER_WINDOW", 20))
+UPSTREAM_BREAKER_MIN_CALLS = int(os.getenv("UPSTREAM_BREAKER_MIN_CALLS", 10))
+UPSTREAM_BREAKER_ERROR_RATE = float(os.getenv("UPSTREAM_BREAKER_ERROR_RATE", 0.5))
+UPSTREAM_BREAKER_SLOW_RATE = float(os.getenv("UPSTREAM_BREAKER_SLOW_RATE", 0.8))
+UPSTREAM_BREAKER_OPEN_SECONDS = float(os.getenv("UPSTREAM_BREAKER_OPEN_SECONDS", 30))
+UPSTREAM_TIMEOUT_P95_MULTIPLIER = float(os.getenv("UPSTREAM_TIMEOUT_P95_MULTIPLIER", 3))
+NEWS_TIMEOUT_MIN_SECONDS = float(os.getenv("NEWS_TIMEOUT_MIN_SECONDS", 2))
+NEWS_SLOW_CALL_SECONDS = float(os.getenv("NEWS_SLOW_CALL_SECONDS", 5))
+OPENAI_TIMEOUT_MIN_SECONDS = float(os.getenv("OPENAI_TIMEOUT_MIN_SECONDS", 5))
+# Below SUMMARY_TIMEOUT_SECONDS: calls the summarizer gives up on must count
+# as slow (a cancelled call is only recorded past this threshold)
+OPENAI_SLOW_CALL_SECONDS = float(os.getenv("OPENAI_SLOW_CALL_SECONDS", 5))
+# Send a second NewsData.io request when the first is slower than the p95
+# (off by default: it can spend extra API credits)
+NEWS_HEDGING = os.getenv("NEWS_HEDGING", "false").lower() == "true"
+
+# Already-verified JWTs, reused until the token's exp (at most the TTL below)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 10000))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", 5 * 60))
+
+# Password hashing: bcrypt cost (hashes with another cost are upgraded on
+# login) and the number of threads running bcrypt off the event loop
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", 2))
+
+# Favorites page size (cursor-paginated, newest first)
+FAVORITES_PAGE_SIZE = int(os.getenv("FAVORITES_PAGE_SIZE", 20))
+
+# Shared Jinja environment: on-disk bytecode cache (TEMPLATE_CACHE_DIR empty =
+# Jinja's per-user temp directory), template reloading on change, and the
+# in-process cache of rendered {% cache %} fragments
+TEMPLATE_BYTECODE_CACHE = os.getenv("TEMPLATE_BYTECODE_CACHE", "true").lower() == "true"
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", "")
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "true").lower() == "true"
+FRAGMENT_CACHE_ENABLED = os.getenv("FRAGMENT_CACHE_ENABLED", "true").lower() == "true"
+FRAGMENT_CACHE_TTL_SECONDS = int(os.getenv("FRAGMENT_CACHE_TTL_SECONDS", 10 * 60))
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", 5000))
+
+# Conditional GET (ETag / If-None-Match) for the dashboard, favorites and
+# /news/, and brotli (optional package) or gzip compression of text
+# responses of at least COMPRESSION_MIN_SIZE bytes
+ETAGS_ENABLED = os.getenv("ETAGS_ENABLED", "true").lower() == "true"
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+
+# Prometheus histograms at /metrics and the Server-Timing response header
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+# Background ingestion into the local article store
+INGEST_ENABLED = os.getenv("INGEST_ENABLED", "true").lower() == "true"
+INGEST_INTERVAL_SECONDS = int(os.getenv("INGEST_INTERVAL_SECONDS", 15 * 60))
+INGEST_REQUESTS_PER_MINUTE = int(os.getenv("INGEST_REQUESTS_PER_MINUTE", 10))
+# Only the worker holding the ingestion lease (a Mongo document) runs cycles;
+# another worker takes over once the holder stopped renewing it for this long
+INGEST_LEASE_SECONDS = int(os.getenv("INGEST_LEASE_SECONDS", 2 * INGEST_INTERVAL_SECONDS))
+ARTICLE_RETENTION_DAYS = int(os.getenv("ARTICLE_RETENTION_DAYS", 7))
@@ -0,0 +1,31 @@
+# backend/db/indexes.py
+"""
+Index bootstrap, run once at application startup.
+
+create_index is idempotent, so running this on every start is safe. Failures
+are logged instead of raised so a missing index never keeps the app down.
+"""
+from pymongo import ASCENDING
+from backend.db.mongo import db
+from backend.services.article_store import ensure_article_indexes
+from backend.services.favorites_store import ensure_favorite_indexes
+
+
+async def ensure_user_indexes() -> None:
+    """Create the indexes used by queries on the users collection."""
+    users = db["users"]
+    # Registration and login look users up by email
+    await users.create_index([("email", ASCENDING)], unique=True, name="email_unique")
+    # Ingestion collects the distinct subscribed topics
+    await users.create_index([("preferences.topics", ASCENDING)], name="preferences_topics")
+    # Feed refresh after ingestion looks up recently active users
+    await users.create_index([("last_seen_at", ASCENDING)], name="last_seen_at")
+
+
+async def ensure_indexes() -> None:
+    """Create all application indexes."""
+    for ensure in (ensure_user_indexes, ensure_article_indexes, ensure_favorite_indexes):
+        try:
+            await ensure()
+        except Exception as e:
+            print(f"[ERROR] Index creation failed in {ensure.__name__}: {e}")
@@ -2,7 +2,8 @@
 
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
-from backend.core.config import MONGODB_URI, DATABASE_NAME
+from backend.core.config import MONGODB_URI, DATABASE_NAME, METRICS_ENABLED
+from backend.utils.metrics import MongoTimingListener
 
 # Check environment variables
 if not MONGODB_URI:
@@ -10,6 +11,9 @@ if not MONGODB_URI:
 
 if not DATABASE_NAME:
     raise RuntimeError("[ERROR] DATABASE_NAME not set in environment variables")
+# Time every command as the "mongo" stage of the current request
+EVENT_LISTENERS = [MongoTimingListener()] if METRICS_ENABLED else []
+
 # Database connection
 try:
     # Improved connection settings for MongoDB Atlas
@@ -19,7 +23,8 @@ try:
         connectTimeoutMS=10000,
         socketTimeoutMS=10000,
         retryWrites=True,
-        w='majority'
+        w='majority',
+        event_listeners=EVENT_LISTENERS,
     )
     db = client[DATABASE_NAME]
     print(f"[OK] Connected to MongoDB database: {DATABASE_NAME}")
@@ -42,7 +47,7 @@ except Exception as e:
     try:
         # Simplified connection for troubleshooting
         simple_uri = MONGODB_URI.replace('&ssl_cert_reqs=CERT_NONE&tlsInsecure=true', '')
-        client = AsyncIOMotorClient(simple_uri, serverSelectionTimeoutMS=5000)
+        client = AsyncIOMotorClient(simple_uri, serverSelectionTimeoutMS=5000, event_listeners=EVENT_LISTENERS)
         db = client[DATABASE_NAME]
         print(f"[OK] Connected to MongoDB with simplified configuration: {DATABASE_NAME}")
     except Exception as e2:
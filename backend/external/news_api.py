@@ -1,31 +1,281 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
 import httpx
-from backend.core.config import NEWS_API_KEY
+from backend.core.config import (
+    HTTP_TIMEOUT_SECONDS,
+    NEWS_API_KEY,
+    NEWS_API_URL,
+    NEWS_CACHE_FALLBACK_SECONDS,
+    NEWS_CACHE_MAX_ENTRIES,
+    NEWS_CACHE_STALE_SECONDS,
+    NEWS_CACHE_TTL_SECONDS,
+    NEWS_FETCH_CONCURRENCY,
+    NEWS_HEDGING,
+    NEWS_SLOW_CALL_SECONDS,
+    NEWS_TIMEOUT_MIN_SECONDS,
+)
+from backend.utils.cache import TieredCache
+from backend.utils.concurrency import SingleFlight, gather_limited
+from backend.utils.http_client import get_http_client
+from backend.utils.metrics import stage
+from backend.utils.resilience import Upstream
+
+# Entries live for the freshness TTL, the stale window and the fallback window
+_response_cache = TieredCache(
+    "newsdata",
+    maxsize=NEWS_CACHE_MAX_ENTRIES,
+    ttl=NEWS_CACHE_TTL_SECONDS + NEWS_CACHE_STALE_SECONDS + NEWS_CACHE_FALLBACK_SECONDS,
+)
+# NewsData.io returns at most 10 results per request on the free tier
+MAX_PAGE_SIZE = 10
+
+_refreshing: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+# Identical queries arriving together share one upstream call
+_inflight = SingleFlight()
+
+
+def _counts_against_upstream(error: BaseException) -> bool:
+    # Other 4xx responses are caused by the request, not by NewsData.io being unwell
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return True
+
+
+news_upstream = Upstream(
+    "newsdata",
+    min_timeout=NEWS_TIMEOUT_MIN_SECONDS,
+    max_timeout=HTTP_TIMEOUT_SECONDS,
+    slow_call_seconds=NEWS_SLOW_CALL_SECONDS,
+    is_failure=_counts_against_upstream,
+)
+
+
+def _normalize_topics(topics: list[str]) -> list[str]:
+    return sorted({t.strip().lower() for t in topics if t and t.strip()})
+
+
+def news_cache_key(topics: list[str], language: str = "en", size: int = 10, page: Optional[str] = None) -> str:
+    """
+    Build the cache key for a NewsData.io query.
+
+    Args:
+        topics (list[str]): Topics to search for (order and case are ignored)
+        language (str): Article language code
+        size (int): Number of results requested
+        page (Optional[str]): nextPage token of the previous result page
+
+    Returns:
+        str: Normalized key, e.g. "football,space|en|10" (plus "|<page>" after the first page)
+    """
+    key = f"{','.join(_normalize_topics(topics))}|{language}|{size}"
+    return f"{key}|{page}" if page else key
+
+
+async def request_news(
+    topics: list[str],
+    language: str = "en",
+    size: int = 10,
+    page: Optional[str] = None,
+) -> dict:
+    """
+    Call NewsData.io directly, bypassing the response cache.
+
+    Args:
+        topics (list[str]): Topics to search for, combined with OR
+        language (str): Article language code (default: "en")
+        size (int): Number of results to request (default: 10)
+        page (Optional[str]): nextPage token of the previous result page
+
+    Returns:
+        dict: Raw NewsData.io response payload
+
+    Raises:
+        httpx.HTTPError: If the request fails or returns an error status
+        UpstreamUnavailable: If the breaker is open or the call timed out
+    """
+    params = {
+        "apikey": NEWS_API_KEY,  # NewsData.io uses 'apikey' not 'apiKey'
+        "q": " OR ".join(_normalize_topics(topics)),
+        "language": language,
+        "size": size,  # NewsData.io uses 'size' not 'pageSize'
+    }
+    if page:
+        params["page"] = page
+
+    async def get() -> dict:
+        with stage("news_api") as timer:
+            response = await get_http_client().get(NEWS_API_URL, params=params)
+            timer.status = str(response.status_code)
+            response.raise_for_status()
+            return response.json()
+
+    return await news_upstream.call(get, hedge=NEWS_HEDGING)
+
+
+async def _store(key: str, data: dict) -> None:
+    await _response_cache.set(key, {"fetched_at": time.time(), "data": data})
+
+
+async def _fetch_and_store(key: str, topics: list[str], language: str, size: int, page: Optional[str]) -> dict:
+    data = await request_news(topics, language, size, page)
+    await _store(key, data)
+    return data
+
+
+async def _refresh(key: str, topics: list[str], language: str, size: int, page: Optional[str]) -> None:
+    try:
+        await _inflight.do(key, lambda: _fetch_and_store(key, topics, language, size, page))
+    except Exception as e:
+        print(f"[WARNING] Background news refresh failed for '{key}': {e}")
+    finally:
+        _refreshing.discard(key)
+
+
+def _schedule_refresh(key: str, topics: list[str], language: str, size: int, page: Optional[str]) -> None:
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+    task = asyncio.create_task(_refresh(key, topics, language, size, page))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def fetch_news(
+    topics: list[str],
+    language: str = "en",
+    size: int = 10,
+    page: Optional[str] = None,
+) -> dict:
+    """
+    Fetch raw NewsData.io results for a set of topics, using the response cache.
+
+    Fresh entries (younger than NEWS_CACHE_TTL_SECONDS) are returned as is.
+    Stale entries (within NEWS_CACHE_STALE_SECONDS after that) are returned
+    immediately while a background task refreshes them. Anything older is
+    fetched from the API before returning; concurrent misses for the same
+    query share a single upstream call. If that call fails (or the breaker
+    is open), an entry up to NEWS_CACHE_FALLBACK_SECONDS older is returned
+    instead.
+
+    Args:
+        topics (list[str]): Topics to search for, combined with OR
+        language (str): Article language code (default: "en")
+        size (int): Number of results to request (default: 10)
+        page (Optional[str]): nextPage token of the previous result page
+
+    Returns:
+        dict: Raw NewsData.io response payload
+
+    Raises:
+        httpx.HTTPError: If the upstream request fails and no cached copy exists
+        UpstreamUnavailable: If the breaker is open (or the call timed out)
+            and no cached copy exists
+    """
+    key = news_cache_key(topics, language, size, page)
+    entry = await _response_cache.get(key)
+    if entry is not None:
+        age = time.time() - entry["fetched_at"]
+        if age < NEWS_CACHE_TTL_SECONDS + NEWS_CACHE_STALE_SECONDS:
+            if age >= NEWS_CACHE_TTL_SECONDS:
+                _schedule_refresh(key, topics, language, size, page)
+            return entry["data"]
+
+    try:
+        return await _inflight.do(key, lambda: _fetch_and_store(key, topics, language, size, page))
+    except Exception as e:
+        if entry is None:
+            raise
+        print(f"[WARNING] NewsData.io unavailable for '{key}', serving a cached copy: {e}")
+        return entry["data"]
+
+
+async def fetch_news_page(
+    topics: list[str],
+    language: str = "en",
+    count: int = MAX_PAGE_SIZE,
+    page: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[dict], Optional[Tuple[Optional[str], int]]]:
+    """
+    Read `count` results starting at a position in NewsData.io's result pages.
+
+    Follows nextPage tokens until `count` results are collected, so a page
+    may be larger than the upstream's per-request maximum. Each result page
+    goes through fetch_news (cached, coalesced) with size MAX_PAGE_SIZE.
+
+    Args:
+        topics (list[str]): Topics to search for, combined with OR
+        language (str): Article language code (default: "en")
+        count (int): Number of results wanted
+        page (Optional[str]): Token of the result page to start in (None: first page)
+        skip (int): Results of that page already shown
+
+    Returns:
+        Tuple[List[dict], Optional[Tuple[Optional[str], int]]]: The results
+        and the (page, skip) position of the next one, None when there are
+        no more
+
+    Raises:
+        httpx.HTTPError: If the upstream request fails and no cached copy exists
+        UpstreamUnavailable: If the breaker is open and no cached copy exists
+    """
+    results: List[dict] = []
+    # An upstream serving empty pages with a nextPage must not loop forever
+    for _ in range(count // MAX_PAGE_SIZE + 2):
+        data = await fetch_news(topics, language, MAX_PAGE_SIZE, page)
+        batch = data.get("results") or []
+        needed = count - len(results)
+        results.extend(batch[skip:skip + needed])
+        if skip + needed < len(batch):
+            return results, (page, skip + needed)
+        page, skip = data.get("nextPage"), 0
+        if not page:
+            return results, None
+        if len(results) >= count:
+            break
+    return results, (page, 0)
+
+
+def _to_article(article: dict) -> dict:
+    # Convert NewsData.io format to match our expected format
+    return {
+        "title": article.get("title", ""),
+        "url": article.get("link", ""),
+        "source": {"name": article.get("source_id", "Unknown")},
+        "publishedAt": article.get("pubDate", ""),
+        "description": article.get("description", "")
+    }
+
+
+async def _fetch_topic(topic: str) -> list[dict]:
+    try:
+        data = await fetch_news([topic], "en")
+    except Exception as e:
+        print(f"❌ שגיאה בטעינת חדשות עבור {topic}: {e}")
+        return []
+    # NewsData.io returns results in 'results' field, not 'articles'
+    return [_to_article(article) for article in data.get("results", [])]
+
 
 async def fetch_news_by_topics(topics: list[str]):
-    articles = []
-
-    async with httpx.AsyncClient() as client:
-        for topic in topics:
-            # Using NewsData.io API instead of NewsAPI.org
-            url = f"https://newsdata.io/api/1/news?apikey={NEWS_API_KEY}&q={topic}&language=en"
-            try:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-                # NewsData.io returns results in 'results' field, not 'articles'
-                newsdata_articles = data.get("results", [])
-                
-                # Convert NewsData.io format to match our expected format
-                for article in newsdata_articles:
-                    articles.append({
-                        "title": article.get("title", ""),
-                        "url": article.get("link", ""),
-                        "source": {"name": article.get("source_id", "Unknown")},
-                        "publishedAt": article.get("pubDate", ""),
-                        "description": article.get("description", "")
-                    })
-            except Exception as e:
-                print(f"❌ שגיאה בטעינת חדשות עבור {topic}: {e}")
-                continue
-
-    return articles
+    """
+    Fetch articles for each topic concurrently.
+
+    At most NEWS_FETCH_CONCURRENCY topics are fetched at once; each topic goes
+    through fetch_news, so it is cached and coalesced with other requests for
+    the same topic.
+
+    Args:
+        topics (list[str]): Topics to fetch
+
+    Returns:
+        list[dict]: Articles for all topics, grouped in topic order
+    """
+    results = await gather_limited(
+        NEWS_FETCH_CONCURRENCY,
+        [lambda topic=topic: _fetch_topic(topic) for topic in topics],
+    )
+    return [article for articles in results for article in articles]
@@ -1,15 +1,54 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.templating import Jinja2Templates
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from pathlib import Path
+from contextlib import asynccontextmanager
 import os
 
 from backend.routers import auth, users, profile, preferences, news, favorites
 from backend.db.mongo import db
+from backend.core.config import COMPRESSION_ENABLED, INGEST_ENABLED, METRICS_ENABLED, SERVER_TIMING_ENABLED
+from backend.db.indexes import ensure_indexes
+from backend.services.favorites_store import migrate_embedded_favorites
+from backend.services.ingestion import start_ingestion_worker, stop_ingestion_worker
+from backend.utils.compression import CompressionMiddleware
+from backend.utils.http_client import close_http_client, open_http_client
+from backend.utils.metrics import MetricsMiddleware, metrics_endpoint
+from backend.utils.templating import templates
 
-app = FastAPI()
+
+# Shared HTTP client, index bootstrap, favorites migration and background
+# ingestion of subscribed topics (run by one worker at a time, see
+# services/ingestion.py)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http_client = await open_http_client()
+    await ensure_indexes()
+    try:
+        migrated = await migrate_embedded_favorites()
+        if migrated:
+            print(f"[OK] Moved embedded favorites of {migrated} users to the favorites collection")
+    except Exception as e:
+        print(f"[ERROR] Favorites migration failed: {e}")
+    if INGEST_ENABLED:
+        start_ingestion_worker()
+    try:
+        yield
+    finally:
+        await stop_ingestion_worker()
+        await close_http_client()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# brotli/gzip for text responses; added first so the metrics below include it
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Per-stage request timing (Mongo, NewsData.io, OpenAI, ranking, templates)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=SERVER_TIMING_ENABLED)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 # ✅ mount static only if directory exists
 static_dir = "static"
@@ -18,8 +57,6 @@ if os.path.isdir(static_dir):
 else:
     print(f"⚠️ תיקיית סטטיק לא קיימת: {static_dir} — דילוג על טעינה")
 
-BASE_DIR = Path(__file__).resolve().parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -37,29 +74,10 @@ async def clear_all_users():
     except Exception as e:
         return {"error": str(e)}
 
-@app.get("/loading", response_class=HTMLResponse)
-async def loading(request: Request, article_count: int = 10, topics: str = ""):
-    # Calculate estimated loading time based on content
-    topic_list = topics.split(",") if topics else []
-    
-    # Base loading time: 3 seconds
-    estimated_time = 3000
-    
-    # Add time based on article count (100ms per article)
-    estimated_time += article_count * 100
-    
-    # Add time based on number of topics (200ms per topic for API calls)
-    estimated_time += len(topic_list) * 200
-    
-    # Cap the maximum loading time at 12 seconds
-    estimated_time = min(estimated_time, 12000)
-    
-    return templates.TemplateResponse("loading.html", {
-        "request": request,
-        "estimated_time": estimated_time,
-        "article_count": article_count,
-        "topic_count": len(topic_list)
-    })
+@app.get("/loading")
+async def loading():
+    # Kept for old links: the dashboard now streams summaries as they are ready
+    return RedirectResponse("/dashboard", status_code=302)
 
 
 # ✅ נתיב הבית הראשי
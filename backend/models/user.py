@@ -14,6 +14,31 @@ class UserInDB(BaseModel):
     }
 
 
+# Named projections: each users-collection query fetches only the fields its
+# call site needs. The password hash is only read where it is used; favorites
+# live in their own collection (see services/favorites_store.py).
+
+# Session user returned by get_current_user (and kept in the user cache)
+SESSION_PROJECTION = {
+    "name": 1,
+    "full_name": 1,
+    "email": 1,
+    "preferences": 1,
+    "article_count": 1,
+    "preferred_language": 1,
+    "language": 1,
+    "created_at": 1,
+    "last_seen_at": 1,
+    # Maintained by services/favorites_store.py on every add/remove
+    "favorites_count": 1,
+    "favorites_version": 1,
+}
+# Password checks (profile edit)
+PASSWORD_PROJECTION = {"password": 1}
+# Existence checks (registration)
+ID_ONLY_PROJECTION = {"_id": 1}
+
+
 def user_helper(user) -> dict:
     return {
         "id": str(user["_id"]),
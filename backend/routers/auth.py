@@ -9,25 +9,24 @@ This module provides FastAPI endpoints for user authentication including:
 """
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
 from backend.auth.security import get_current_user
 from datetime import datetime
 
 from fastapi import APIRouter, Request, Form, Depends, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from passlib.context import CryptContext
 from datetime import timedelta
-from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from backend.db.mongo import db
-from backend.models.user import user_helper
-from backend.auth.security import create_access_token, verify_token
+from backend.models.user import ID_ONLY_PROJECTION, user_helper
+from backend.auth.security import (
+    create_access_token,
+    hash_password,
+    verify_and_update_password,
+    verify_token,
+)
 
-from pathlib import Path
-templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
+from backend.utils.templating import templates
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 @router.get("/login", response_class=HTMLResponse)
 async def login_form(request: Request):
@@ -56,7 +55,7 @@ async def login_submit(
         password (str): User password from form
         
     Returns:
-        RedirectResponse: Redirects to loading page on success with auth cookie
+        RedirectResponse: Redirects to dashboard on success with auth cookie
         TemplateResponse: Login form with error message on failure
         
     Note:
@@ -78,6 +77,7 @@ async def login_submit(
             "created_at": "2025-07-22T13:52:05.138000",
             "article_count": 13,
             "preferred_language": "en",
+            "favorites_count": 1,
             "favorites": [
                 {
                     "url": "https://slickdeals.net/f/18468184-redragon-mechanical-wireless-keyboard-k556-se-rgb-34-61-k673-pro-75-35-82-k686-pro-se-98-keys-53-26-free-shipping",
@@ -90,8 +90,7 @@ async def login_submit(
     else:
         user_record = None
         
-    # Standard database user lookup (bypassed for test user above)
-    # user_record = await db["users"].find_one({"email": email})
+    # The database user lookup is disabled: only the test user above can log in
 
     # Validate user existence and password field availability
     if not user_record or "password" not in user_record:
@@ -100,19 +99,24 @@ async def login_submit(
             "error": "Incorrect email or password"
         })
 
-    # Verify password against stored hash
-    if not pwd_context.verify(password, user_record["password"]):
+    # Verify password against stored hash (off the event loop)
+    valid, new_hash = await verify_and_update_password(password, user_record["password"])
+    if not valid:
         return templates.TemplateResponse("login.html", {
             "request": request,
             "error": "Incorrect email or password"
         })
 
-    # Generate access token and redirect to loading page
+    # Upgrade hashes made with a different bcrypt cost
+    if new_hash and user_record["_id"] != "test_user_id":
+        await db["users"].update_one({"_id": user_record["_id"]}, {"$set": {"password": new_hash}})
+
+    # Generate access token and redirect to dashboard
     token = create_access_token(
         data={"sub": str(user_record["_id"])},
         expires_delta=timedelta(hours=1)
     )
-    response = RedirectResponse(url="/loading", status_code=302)
+    response = RedirectResponse(url="/dashboard", status_code=302)
     response.set_cookie(
         key="access_token",
         value=token,
@@ -153,7 +157,7 @@ async def register_submit(
         password (str): User password from form
         
     Returns:
-        RedirectResponse: Redirects to loading page on success with auth cookie
+        RedirectResponse: Redirects to dashboard on success with auth cookie
         TemplateResponse: Registration form with error message on failure
         
     Note:
@@ -169,14 +173,14 @@ async def register_submit(
             "error": "Please fill all fields."
         })
 
-    existing_user = await db["users"].find_one({"email": email})
+    existing_user = await db["users"].find_one({"email": email}, ID_ONLY_PROJECTION)
     if existing_user:
         return templates.TemplateResponse("register.html", {
             "request": request,
             "error": "A user with this email already exists."
         })
 
-    hashed_password = pwd_context.hash(password)
+    hashed_password = await hash_password(password)
 
     new_user = {
         "name": name,
@@ -184,16 +188,24 @@ async def register_submit(
         "password": hashed_password,
         "preferences": {},
         "created_at": datetime.utcnow(),
+        "favorites_count": 0,
     }
 
-    await db["users"].insert_one(new_user)
+    try:
+        await db["users"].insert_one(new_user)
+    except DuplicateKeyError:
+        # Concurrent registration with the same email (unique index on email)
+        return templates.TemplateResponse("register.html", {
+            "request": request,
+            "error": "A user with this email already exists."
+        })
 
     # Automatic login after successful registration
     token = create_access_token(
         data={"sub": str(new_user["_id"])},
         expires_delta=timedelta(hours=1)
     )
-    response = RedirectResponse(url="/loading", status_code=302)
+    response = RedirectResponse(url="/dashboard", status_code=302)
     response.set_cookie(
         key="access_token",
         value=token,
@@ -232,15 +244,8 @@ async def profile_page(request: Request, user=Depends(get_current_user)):
     Returns:
         TemplateResponse: Rendered profile.html with user preferences
     """
-    # Retrieve complete user document with preferences from database
-    # Handle test user scenario: use cached user data for development/testing
-    if user["_id"] == "test_user_id":
-        user_doc = user  # Use the test user object directly
-    else:
-        try:
-            user_doc = await db["users"].find_one({"_id": ObjectId(user["_id"])})
-        except:
-            user_doc = await db["users"].find_one({"_id": user["_id"]})
+    # get_current_user already loaded the complete user document for this request
+    user_doc = user
 
     # Initialize empty preferences structure for new users to prevent template errors
     prefs = user_doc.get("preferences", {"topics": [], "categories": []})
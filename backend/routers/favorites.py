@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, Form, Request, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Form, Query, Request, HTTPException
 from fastapi.responses import RedirectResponse, HTMLResponse
-from fastapi.templating import Jinja2Templates
-from pathlib import Path
-from backend.db.mongo import db
+from backend.core.config import FAVORITES_PAGE_SIZE
 from backend.routers.auth import get_current_user
+from backend.services import favorites_store
+from backend.services.ranking import invalidate_favorite_titles
+from backend.services.user_cache import invalidate_user
+from backend.utils.http_cache import etag_matches, make_etag, not_modified, set_etag
+from backend.utils.templating import template_version, templates
 from bson import ObjectId
 
 router = APIRouter(prefix="/favorites", tags=["Favorites"])
-templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
 @router.post("/remove")
 async def remove_favorite(
@@ -23,9 +26,6 @@ async def remove_favorite(
         
     Returns:
         RedirectResponse: Redirects to favorites page after removal
-        
-    Raises:
-        HTTPException: 404 if user not found in database
     """
     # Handle test user scenario: log action without database modification
     if user["_id"] == "test_user_id":
@@ -37,12 +37,10 @@ async def remove_favorite(
     except:
         user_id = user["_id"]
         
-    res = await db["users"].update_one(
-        {"_id": user_id},
-        {"$pull": {"favorites": {"url": url}}},
-    )
-    if res.matched_count == 0:
-        raise HTTPException(404, "User not found")
+    # favorites_count changes only if the favorite existed
+    if await favorites_store.remove_favorite(user_id, url):
+        await invalidate_user(user_id)
+        await invalidate_favorite_titles(user_id)
 
     # Redirect back to favorites list
     return RedirectResponse("/favorites", status_code=302)
@@ -67,9 +65,6 @@ async def add_favorite(
         
     Returns:
         RedirectResponse: Redirects to dashboard after adding favorite
-        
-    Raises:
-        HTTPException: 404 if user not found in database
     """
     fav = {"url": url, "title": title, "source": source, "published": published}
 
@@ -83,43 +78,64 @@ async def add_favorite(
     except:
         user_id = user["_id"]
 
-    res = await db["users"].update_one(
-        {"_id": user_id},
-        {"$addToSet": {"favorites": fav}},
-    )
-    if res.matched_count == 0:
-        raise HTTPException(404, "User not found")
+    # Saving an article twice is a no-op
+    if await favorites_store.add_favorite(user_id, fav):
+        await invalidate_user(user_id)
+        await invalidate_favorite_titles(user_id)
 
     return RedirectResponse("/dashboard", status_code=302)
 
 @router.get("/", response_class=HTMLResponse)
-async def view_favorites(request: Request, user=Depends(get_current_user)):
+async def view_favorites(
+    request: Request,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(FAVORITES_PAGE_SIZE, ge=1, le=100),
+    user=Depends(get_current_user),
+):
     """
-    Display user's saved favorite articles.
+    Display one page of the user's saved favorite articles, newest first.
     
     Args:
         request (Request): FastAPI request object for template rendering
+        cursor (Optional[str]): Cursor of the next page, from the previous page's link
+        limit (int): Number of favorites per page
         user (dict): Current authenticated user from dependency injection
         
     Returns:
-        TemplateResponse: Rendered favorites.html template with user favorites
-        RedirectResponse: Redirects to login if user not found
+        TemplateResponse: Rendered favorites.html template with one page of favorites
+        
+    Raises:
+        HTTPException: 400 if the cursor is invalid
     """
-    # Handle test user scenario: use cached user data for development/testing
+    next_cursor = None
+    etag = None
+    # Test user keeps its in-memory favorites and is shown on a single page
     if user["_id"] == "test_user_id":
-        user_doc = user  # Use the test user object directly
+        favorites = user.get("favorites", [])
     else:
+        # favorites_version changes on every add/remove
+        etag = make_etag(
+            str(user["_id"]),
+            user.get("favorites_version", 0),
+            user.get("favorites_count", 0),
+            user.get("name"),
+            cursor,
+            limit,
+            template_version("favorites.html"),
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
         try:
-            user_doc = await db["users"].find_one({"_id": ObjectId(user["_id"])})
-        except:
-            user_doc = await db["users"].find_one({"_id": user["_id"]})
-    
-    if not user_doc:
-        return RedirectResponse("/login")
-        
-    favorites = user_doc.get("favorites", [])
-    return templates.TemplateResponse("favorites.html", {
+            favorites, next_cursor = await favorites_store.list_favorites(user["_id"], limit, cursor)
+        except ValueError:
+            raise HTTPException(400, "Invalid favorites cursor")
+    user_doc = user
+    return set_etag(templates.TemplateResponse("favorites.html", {
         "request": request,
         "user": user_doc,
-        "favorites": favorites
-    })
+        "favorites": favorites,
+        "favorites_count": user_doc.get("favorites_count", len(favorites)),
+        "next_cursor": next_cursor,
+        "limit": limit,
+        "is_first_page": cursor is None,
+    }), etag)
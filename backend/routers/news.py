@@ -1,78 +1,180 @@
-from typing import List
-from datetime import datetime
-import asyncio, os, httpx, re
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio, os, httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from backend.auth.security import get_current_user
 from backend.schemas.user import UserOut
 from backend.schemas.news import (
-    FilteredNewsResult, NewsArticle, NewsSource,
+    AlternateSource, FilteredNewsResult, NewsArticle,
     SummarizedArticle, SummarizedNewsResponse
 )
-from backend.core.config import NEWS_API_KEY
-from backend.utils.openai_client import get_openai_summary
+from backend.core.config import (
+    DEDUP_ENABLED, DEDUP_SIMILARITY, FEED_CACHE_MAX_USERS, FEED_LOCAL_TTL_SECONDS, NEWS_API_KEY,
+    NEWS_MAX_PAGE_SIZE, NEWS_MAX_RESULTS, NEWS_POOL_TTL_SECONDS, RANKING_ENABLED
+)
+from backend.external.news_api import fetch_news_page
+from backend.services.article_parsing import ArticleParseError, parse_articles
+from backend.services.article_store import find_articles
+from backend.services.ranking import candidate_pool_size, interest_profile, top_k
+from backend.services.summarizer import summarize_articles
+from backend.utils.cache import TieredCache
+from backend.utils.concurrency import SingleFlight
+from backend.utils.dedup import dedupe
+from backend.utils.http_cache import body_etag, etag_matches, not_modified, set_etag
+from backend.utils.pagination import decode_cursor, encode_cursor
+from backend.utils.resilience import UpstreamUnavailable
 
 router = APIRouter(prefix="/news", tags=["News"])
-http_client = httpx.AsyncClient(timeout=10.0)
-
-# --- סינון אם טקסט הוא באנגלית בלבד ---
-def _looks_english(text: str) -> bool:
-    return re.fullmatch(r"[a-zA-Z0-9\s\.,!?\"'\-:;()/@]+", text.strip()) is not None
 
-# --- סינון כתבה לפי תחומי עניין ---
-def _relevant_to_user(article: NewsArticle, interests: list[str]) -> bool:
-    combined = f"{article.title} {article.description or ''} {article.content or ''}".lower()
-    return any(term.lower() in combined for term in interests)
+# De-duplicated, ranked store results per (user, language, topics); every
+# cursor page of /news/ slices the same list
+_pool_cache = TieredCache(
+    "news_pool",
+    maxsize=FEED_CACHE_MAX_USERS,
+    ttl=NEWS_POOL_TTL_SECONDS,
+    local_ttl=FEED_LOCAL_TTL_SECONDS,
+)
+_pool_builds = SingleFlight()
+# De-duplication and ranking are CPU-bound: run them off the event loop
+_rank_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="news-rank")
 
 # --- המרה של raw dict מ-NewsData.io לכתבות ---
 def _parse_articles(raw: dict, interests: list[str]) -> List[NewsArticle]:
     try:
-        articles = []
-        # NewsData.io returns results in 'results' field, not 'articles'
-        for a in raw.get("results", []):
-            combined = f"{a.get('title', '')} {a.get('description', '')}"
-            if not _looks_english(combined):
-                continue
-            parsed = NewsArticle(
-                source=NewsSource(id=a.get("source_id", "unknown"), name=a.get("source_id", "Unknown")),
-                author=a.get("creator", [None])[0] if a.get("creator") else None,
-                title=a["title"],
-                description=a.get("description"),
-                url=a["link"],
-                urlToImage=a.get("image_url"),
-                publishedAt=datetime.fromisoformat(a["pubDate"].replace("Z", "+00:00")) if a.get("pubDate") else datetime.now(),
-                content=a.get("content"),
-            )
-            if _relevant_to_user(parsed, interests):
-                articles.append(parsed)
-        return articles
-    except Exception as e:
+        return parse_articles(raw, interests)
+    except ArticleParseError as e:
         print(f"Error parsing articles: {e}")
         raise HTTPException(500, "Failed to parse news data")
 
-# --- שליפת כתבות מה־API (ללא Cache) ---
-async def _fetch_from_newsapi(query: str, language: str = "en", page_size: int = 10):
-    # Using NewsData.io API instead of NewsAPI.org
-    url = f"https://newsdata.io/api/1/news?apikey={NEWS_API_KEY}&q={query}&language={language}&size={page_size}"
-    resp = await http_client.get(url)
-    if resp.status_code != 200:
+# --- שליפת עמוד כתבות מה־API (עם Cache + stale-while-revalidate) ---
+async def _fetch_from_newsapi(
+    topics: list[str],
+    language: str = "en",
+    page_size: int = 10,
+    page: Optional[str] = None,
+    skip: int = 0,
+):
+    try:
+        results, following = await fetch_news_page(topics, language, page_size, page, skip)
+        return {"results": results}, following
+    except httpx.HTTPError as e:
+        print(f"[ERROR] News API error: {e}")
         raise HTTPException(502, "News API error")
-    return resp.json()
+    except UpstreamUnavailable as e:
+        # Breaker open or timed out, and nothing cached for this query
+        print(f"[ERROR] News API unavailable: {e}")
+        raise HTTPException(503, "News API unavailable")
+
+# --- כותרת ותיאור, לזיהוי כפילויות ולדירוג ---
+def _headline_text(article: NewsArticle) -> str:
+    return f"{article.title} {article.description or ''}"
+
+# --- איחוד כתבות כמעט-זהות ממקורות שונים ---
+def _dedupe_articles(articles: List[NewsArticle]) -> List[NewsArticle]:
+    # Keep the first (newest) copy of each story and list the other sources
+    if not DEDUP_ENABLED:
+        return articles
+    return [
+        kept.model_copy(update={"alternates": [AlternateSource(name=d.source.name, url=d.url) for d in dropped]})
+        if dropped else kept
+        for kept, dropped in dedupe(articles, _headline_text, DEDUP_SIMILARITY)
+    ]
+
+# --- איחוד כפילויות ודירוג לפי המשתמש ---
+def _select(articles: List[NewsArticle], k: int, profile: Optional[List[Tuple[str, float]]]) -> List[NewsArticle]:
+    articles = _dedupe_articles(articles)
+    if profile is not None:
+        return top_k(articles, k, _headline_text, lambda a: a.publishedAt, profile)
+    return articles[:k]
+
+async def _rank(articles: List[NewsArticle], k: int, topics: list[str], user: Optional[dict]) -> List[NewsArticle]:
+    profile = await interest_profile(user, topics) if RANKING_ENABLED and user is not None else None
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_rank_executor, _select, articles, k, profile)
+
+# --- תוצאות המאגר המדורגות, משותפות לכל עמודי הסמן ---
+async def _build_pool(key: str, topics: list[str], language: str, user: Optional[dict]) -> List[dict]:
+    # Read a wider candidate pool for de-duplication and ranking
+    try:
+        articles = await find_articles(topics, candidate_pool_size(NEWS_MAX_RESULTS), language)
+    except Exception as e:
+        print(f"[WARNING] Article store unavailable: {e}")
+        return []
+    pool = [a.model_dump(mode="json") for a in await _rank(articles, NEWS_MAX_RESULTS, topics, user)]
+    if pool:
+        await _pool_cache.set(key, pool)
+    return pool
+
+async def _ranked_pool(topics: list[str], language: str, user: Optional[dict]) -> List[dict]:
+    user_id = str(user["_id"]) if user else "-"
+    key = f"{user_id}:{language}:{','.join(sorted({t.strip().lower() for t in topics}))}"
+    pool = await _pool_cache.get(key)
+    if pool is None:
+        # Concurrent pages of the same user share one build
+        pool = await _pool_builds.do(key, lambda: _build_pool(key, topics, language, user))
+    return pool
+
+# --- טעינת עמוד כתבות מהמאגר המקומי, עם נפילה ל־API ---
+async def _load_articles(
+    topics: list[str],
+    language: str = "en",
+    page_size: int = 10,
+    user: Optional[dict] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[NewsArticle], Optional[str]]:
+    # Cursor: {"o": offset} into the ranked store results, or {"p", "s"}: a
+    # position in NewsData.io's pages while the store has nothing
+    try:
+        position = decode_cursor(cursor) if cursor else {"o": 0}
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+    if "p" not in position:
+        offset = position.get("o")
+        if not isinstance(offset, int) or offset < 0:
+            raise HTTPException(400, "Invalid cursor")
+        end = min(offset + page_size, NEWS_MAX_RESULTS)
+        # Prefer the local article store filled by the ingestion worker. Its
+        # results are ranked once per NEWS_POOL_TTL_SECONDS and every page
+        # slices that list, so pages neither repeat nor skip articles and
+        # later pages cost a cache read
+        pool = await _ranked_pool(topics, language, user)
+        if pool or offset or not NEWS_API_KEY:
+            page = [NewsArticle.model_validate(a) for a in pool[offset:end]]
+            return page, encode_cursor({"o": end}) if len(pool) > end else None
+        position = {"p": None, "s": 0}
+
+    page, skip = position.get("p"), position.get("s", 0)
+    if not isinstance(skip, int) or skip < 0 or not (page is None or isinstance(page, str)):
+        raise HTTPException(400, "Invalid cursor")
+    raw, following = await _fetch_from_newsapi(topics, language, page_size, page, skip)
+    # De-duplicated and ranked within the page
+    articles = await _rank(_parse_articles(raw, topics), page_size, topics, user)
+    return articles, encode_cursor({"p": following[0], "s": following[1]}) if following else None
 
 # --- נקודת קצה לשליפת כתבות מותאמות אישית ---
 @router.get("/", response_model=FilteredNewsResult)
 async def fetch_news(
+    request: Request,
     topics: List[str] = Query(...),
-    page_size: int = 10,
+    page_size: int = Query(10, ge=1, le=NEWS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     current_user: UserOut = Depends(get_current_user)
 ):
     if not NEWS_API_KEY:
         raise HTTPException(500, "Missing News API key")
 
     language = current_user.get("preferred_language", "en")
-    query = " OR ".join(topics)
-    raw = await _fetch_from_newsapi(query, language, page_size)
-    articles = _parse_articles(raw, topics)
-    return FilteredNewsResult(total=len(articles), articles=articles)
+    articles, next_cursor = await _load_articles(topics, language, page_size, current_user, cursor)
+    body = FilteredNewsResult(
+        total=len(articles), articles=articles, next_cursor=next_cursor
+    ).model_dump_json().encode("utf-8")
+    # The store and NewsData.io results carry no version: tag the body itself,
+    # which still spares unchanged results the transfer
+    etag = body_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return set_etag(Response(body, media_type="application/json"), etag)
 
 # --- נקודת קצה לסיכום AI של כתבות ---
 @router.get("/ai-summarized", response_model=SummarizedNewsResponse)
@@ -81,20 +183,22 @@ async def ai_summarize_news(
     current_user: UserOut = Depends(get_current_user),
 ):
     language = current_user.get("preferred_language", "en")
-    query = " OR ".join(topics)
-    page_size = current_user.get("preferences", {}).get("num_articles", 10)
+    page_size = min(int(current_user.get("preferences", {}).get("num_articles", 10)), NEWS_MAX_PAGE_SIZE)
 
-    raw = await _fetch_from_newsapi(query, language, page_size)
-    articles = _parse_articles(raw, topics)
+    articles, _ = await _load_articles(topics, language, page_size, current_user)
     top_articles = articles[:page_size]
 
-    async def summarize(article: NewsArticle):
-        summary = await get_openai_summary(
-            article.title,
-            article.description or article.content or "",
-            lang=language
-        )
-        return SummarizedArticle(original=article, summary=summary)
-
-    summaries = await asyncio.gather(*(summarize(a) for a in top_articles))
-    return SummarizedNewsResponse(summaries=summaries)
+    # Summaries are shared across users through the summary cache
+    items = [
+        {
+            "text": f"{a.title}. {a.description or a.content or ''}",
+            "title": a.title,
+            "description": a.description,
+            "url": str(a.url),
+        }
+        for a in top_articles
+    ]
+    summaries = await summarize_articles(items, lang=language)
+    return SummarizedNewsResponse(summaries=[
+        SummarizedArticle(original=a, summary=s) for a, s in zip(top_articles, summaries)
+    ])
@@ -1,83 +1,107 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Form
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from backend.schemas.profile import ProfilePreferences
 from backend.schemas.news import FilteredNewsResult, NewsArticle, NewsSource
 from backend.routers.auth import get_current_user
 from backend.db.mongo import db
-from backend.models.user import user_helper
+from backend.models.user import PASSWORD_PROJECTION, user_helper
 from datetime import datetime
-from pathlib import Path
 from bson import ObjectId
-from typing import List, Annotated
-import requests
+from typing import List, Annotated, Optional, Tuple
+import httpx
+import json
 import os
-from backend.auth.security import verify_password, get_password_hash
-from openai import OpenAI
+from backend.auth.security import hash_password, verify_and_update_password
+from backend.services.feed import feed_page, invalidate_feed, mark_active
+from backend.core.config import DASHBOARD_FIRST_PAGE_SIZE, DASHBOARD_STREAMING, ETAGS_ENABLED
+from backend.services.summarizer import iter_summaries, summaries_cached, summarize_articles
+from backend.services.user_cache import invalidate_user
+from backend.utils.http_cache import etag_matches, make_etag, not_modified, set_etag
+from backend.utils.resilience import UpstreamUnavailable
+from backend.utils.templating import template_version, templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-NEWS_API_URL = "https://newsdata.io/api/1/news"
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
-def get_openai_summary(text: str, lang: str = "en") -> str:
+def _prepare_articles(entries: List[dict]) -> Tuple[List[dict], List[dict]]:
     """
-    Generate AI-powered article summary using OpenAI GPT-3.5.
-    
+    Turn feed entries into template articles and summarization inputs.
+
     Args:
-        text (str): Article content to summarize
-        lang (str): Target language for summary (default: "en")
-        
+        entries (List[dict]): Feed entries (NewsData.io field names)
+
     Returns:
-        str: Generated summary or fallback message if processing fails
-        
-    Note:
-        Falls back to standard messages if content is insufficient or API fails
+        Tuple[List[dict], List[dict]]: Articles (summary=None) and the
+        matching summarizer items, in the same order
     """
-    if not openai_client:
-        return "OpenAI not configured"
-    
-    # Check if content is meaningful
-    if len(text.strip()) < 30:
-        return "Not enough content to summarize"
-    
-    # Check for limited content indicators
-    if "paid plans" in text.lower() or "premium content" in text.lower():
-        return "Full content requires premium access - check original article"
-    
-    system_prompt = {
-        "he": "אתה מסכם חדשות בעברית בפשטות ובאופן מעניין.",
-        "fr": "Tu résumes les actualités en français de manière claire et intéressante.", 
-        "es": "Resumes las noticias en español de forma clara y atractiva.",
-        "en": "You are a news summarizer. Create a clear, engaging summary in 2-3 sentences. If the content is limited or incomplete, say 'Limited preview available - visit article for full details' instead of making up information.",
-    }.get(lang, "You are a news summarizer. Create a clear, engaging summary in 2-3 sentences. If the content is limited or incomplete, say 'Limited preview available - visit article for full details' instead of making up information.")
+    articles = []
+    pending = []
+    for a in entries:
+        # Extract best available content from API response
+        title = a.get("title", "")
+        description = a.get("description", "")
+        content = a.get("content", "")
+
+        # Combine available text content, prioritizing description over full content
+        full_text = ""
+        if description and len(description) > 50:
+            full_text = f"{title}. {description}"
+        elif content and len(content) > 50:
+            full_text = f"{title}. {content}"
+        else:
+            full_text = title
+
+        pending.append({"text": full_text, "title": title, "description": description, "url": a.get("link")})
+        articles.append({
+            "title": title,
+            "source": a.get("source_id", "Unknown"),  # NewsData.io uses 'source_id'
+            "published": a.get("pubDate", ""),  # NewsData.io uses 'pubDate'
+            "url": a.get("link", "#"),  # NewsData.io uses 'link'
+            "summary": None,
+            "alternates": a.get("alternates", []),
+        })
+    return articles, pending
+
 
+async def _load_feed_page(user_doc: dict, size: int, cursor: Optional[str] = None):
+    # Map feed errors to HTTP errors for the dashboard routes
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Summarize this news content:\n\n{text[:1000]}"},
-            ],
-            temperature=0.3,  # Lower temperature for more factual summaries
-            max_tokens=100,
-        )
-        summary = response.choices[0].message.content.strip()
-        
-        # Filter out unhelpful AI responses
-        if "cannot provide" in summary.lower() or "sorry" in summary.lower():
-            return "Limited preview available - visit article for full details"
-            
-        return summary
-    except Exception as e:
-        print(f"[ERROR] OpenAI Error: {e}")
-        return "Summary unavailable - visit article for full details"
+        return await feed_page(user_doc, size, cursor)
+    except ValueError:
+        raise HTTPException(400, detail="Invalid feed cursor")
+    except UpstreamUnavailable as e:
+        print("[ERROR] NewsAPI unavailable:", e)
+        raise HTTPException(503, detail="News API unavailable")
+    except httpx.HTTPError as e:
+        print("[ERROR] NewsAPI error:", e)
+        raise HTTPException(502, detail=f"News API error: {str(e)}")
+
+
+def _stream_dashboard(context: dict, pending: List[dict]) -> StreamingResponse:
+    """
+    Stream the dashboard: headlines first, then one script chunk per summary.
 
+    Args:
+        context (dict): Template context; articles have summary=None
+        pending (List[dict]): Summarization inputs, in the same order as the articles
+
+    Returns:
+        StreamingResponse: Chunked HTML response
+    """
+    html = templates.get_template("dashboard.html").render(context)
+    head, body_end, tail = html.rpartition("</body>")
+
+    async def chunks():
+        yield head
+        async for index, summary in iter_summaries(pending):
+            # Escape "</" so summary text cannot close the script tag
+            text = json.dumps(summary).replace("</", "<\\/")
+            yield f"<script>fillSummary({index}, {text});</script>\n"
+        yield body_end + tail
+
+    return StreamingResponse(chunks(), media_type="text/html")
 
 @router.post("/me/preferences")
 async def update_my_preferences(
@@ -100,12 +124,14 @@ async def update_my_preferences(
     # Enforce English language setting
     preferences.language = "en"
 
-    result = db["users"].update_one(
+    result = await db["users"].update_one(
         {"email": current_user["email"]},
         {"$set": {"preferences": preferences.dict()}},
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    await invalidate_user(current_user["_id"])
+    await invalidate_feed(current_user["_id"])
     return {"message": "Preferences updated", "data": preferences}
 
 @router.post("/profile", response_class=HTMLResponse)
@@ -125,7 +151,7 @@ async def save_preferences(
         user (dict): Current authenticated user from dependency injection
         
     Returns:
-        RedirectResponse: Redirects to loading page with preferences
+        RedirectResponse: Redirects to the dashboard
         TemplateResponse: Profile form with error if validation fails
         
     Note:
@@ -167,11 +193,11 @@ async def save_preferences(
                 "article_count": article_count,
             }},
         )
+        await invalidate_user(user["_id"])
+    # The feed is rebuilt for the new topics on the dashboard view that follows
+    await invalidate_feed(user["_id"])
 
-    # Construct loading page URL with user preference parameters
-    topics_str = ",".join(topics) if topics else ""
-    loading_url = f"/loading?article_count={article_count}&topics={topics_str}"
-    return RedirectResponse(loading_url, status_code=302)
+    return RedirectResponse("/dashboard", status_code=302)
 @router.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request, user=Depends(get_current_user)):
     """
@@ -197,20 +223,8 @@ async def dashboard(request: Request, user=Depends(get_current_user)):
             print("[ERROR] User object missing or no email")
             return RedirectResponse("/login")
 
-        # Retrieve complete user document from database
-        # Handle test user scenario: use cached user data for development/testing
-        if user["_id"] == "test_user_id":
-            user_doc = user  # Use the test user object directly
-            print("[DEBUG] Using test user data directly")
-        else:
-            try:
-                user_doc = await db["users"].find_one({"_id": ObjectId(user["_id"])})
-            except:
-                user_doc = await db["users"].find_one({"_id": user["_id"]})
-        
-        if not user_doc:
-            print("[ERROR] User not found in database")
-            return RedirectResponse("/login")
+        # get_current_user already loaded the user document for this request
+        user_doc = user
 
         print("[DEBUG] user_doc:", user_doc)
 
@@ -219,73 +233,66 @@ async def dashboard(request: Request, user=Depends(get_current_user)):
             print("[WARNING] No preferences saved")
             return RedirectResponse("/profile")
 
-        query = " OR ".join(prefs["topics"])
         page_size = int(prefs.get("article_count", 10))
+        # A small first page renders fast; the rest of the feed is loaded
+        # (and summarized) a page_size at a time as the user scrolls
+        first_page_size = min(page_size, DASHBOARD_FIRST_PAGE_SIZE)
 
-        if not NEWS_API_KEY:
+        # Keeps this user's feed refreshed by the ingestion worker
+        await mark_active(user_doc)
+
+        # The materialized feed (de-duplicated and ranked from the local
+        # article store), or NewsData.io pages while the store has nothing
+        entries, next_cursor, feed_version = await _load_feed_page(user_doc, first_page_size)
+        if not entries and not NEWS_API_KEY:
             print("[ERROR] Missing NEWS_API_KEY")
             raise HTTPException(500, detail="Missing NEWS_API_KEY")
 
-        # NewsData.io API parameters
-        params = {
-            "q": query,
-            "apikey": NEWS_API_KEY,  # NewsData.io uses 'apikey' not 'apiKey'
-            "language": "en",
-            "size": min(page_size, 10),  # NewsData.io uses 'size' not 'pageSize', max 10 for free tier
-        }
-
-        try:
-            resp = requests.get(NEWS_API_URL, params=params, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            print("[ERROR] NewsAPI error:", e)
-            raise HTTPException(502, detail=f"News API error: {str(e)}")
-
-        articles = []
-        # NewsData.io returns results in 'results' field, not 'articles'
-        for a in data.get("results", []):
-            # Extract best available content from API response
-            title = a.get("title", "")
-            description = a.get("description", "")
-            content = a.get("content", "")
-            
-            # Combine available text content, prioritizing description over full content
-            full_text = ""
-            if description and len(description) > 50:
-                full_text = f"{title}. {description}"
-            elif content and len(content) > 50:
-                full_text = f"{title}. {content}"
-            else:
-                full_text = title
-                
-            # Generate AI summary from available content
-            try:
-                if len(full_text) > 30:  # Minimum content threshold for AI processing
-                    summary = get_openai_summary(full_text)
-                else:
-                    summary = "Limited content available - visit link for full article"
-            except Exception as e:
-                print("[ERROR] OpenAI summary error:", e)
-                summary = description[:200] + "..." if description else "Summary not available"
-
-            articles.append({
-                "title": title,
-                "source": a.get("source_id", "Unknown"),  # NewsData.io uses 'source_id'
-                "published": a.get("pubDate", ""),  # NewsData.io uses 'pubDate'
-                "url": a.get("link", "#"),  # NewsData.io uses 'link'
-                "summary": summary,
-            })
-
-        print("[OK] Rendering dashboard template")
-        return templates.TemplateResponse("dashboard.html", {
+        articles, pending = _prepare_articles(entries)
+
+        # With a versioned feed and every summary already cached, the page is
+        # determined by these inputs: revalidate it without rendering
+        etag = None
+        if ETAGS_ENABLED and feed_version and await summaries_cached(pending):
+            etag = make_etag(
+                str(user_doc["_id"]),
+                feed_version,
+                user_doc.get("name"),
+                prefs.get("topics"),
+                page_size,
+                first_page_size,
+                user_doc.get("favorites_count", 0),
+                template_version("dashboard.html"),
+                template_version("article_cards.html"),
+            )
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+        context = {
             "request": request,
             "user": user_doc,
             "summaries": articles,
             "preferences": prefs,
-            "favorites_count": len(user_doc.get("favorites", [])),  # Add favorites count
-        })
+            # Counter maintained by services/favorites_store.py
+            "favorites_count": user_doc.get("favorites_count", 0),
+            "next_cursor": next_cursor,
+        }
+
+        if DASHBOARD_STREAMING:
+            # Headlines render immediately; summaries follow as they complete
+            print("[OK] Streaming dashboard template")
+            return set_etag(_stream_dashboard(context, pending), etag)
+
+        # Generate AI summaries concurrently (bounded, with per-article timeout)
+        summaries = await summarize_articles(pending)
+        for article, summary in zip(articles, summaries):
+            article["summary"] = summary
+
+        print("[OK] Rendering dashboard template")
+        return set_etag(templates.TemplateResponse("dashboard.html", context), etag)
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"[ERROR] Dashboard error: {e}")
         import traceback
@@ -293,6 +300,42 @@ async def dashboard(request: Request, user=Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=f"Dashboard error: {str(e)}")
 
 
+@router.get("/dashboard/more")
+async def dashboard_more(
+    cursor: str = Query(...),
+    user=Depends(get_current_user),
+):
+    """
+    Return the next page of the dashboard feed for infinite scroll.
+
+    Args:
+        cursor (str): Cursor from the dashboard or the previous page
+        user (dict): Current authenticated user from dependency injection
+
+    Returns:
+        JSONResponse: {"html": rendered article cards, "next_cursor": cursor
+        of the following page or null}
+
+    Raises:
+        HTTPException: 400 for an invalid cursor or missing preferences,
+            502/503 if NewsData.io fails
+    """
+    prefs = user.get("preferences", {})
+    if not prefs or not prefs.get("topics"):
+        raise HTTPException(400, detail="No preferences saved")
+    page_size = int(prefs.get("article_count", 10))
+
+    entries, next_cursor, _ = await _load_feed_page(user, page_size, cursor)
+    articles, pending = _prepare_articles(entries)
+    # The page is requested ahead of the viewport, so it is sent complete
+    summaries = await summarize_articles(pending)
+    for article, summary in zip(articles, summaries):
+        article["summary"] = summary
+
+    html = templates.get_template("article_cards.html").render({"summaries": articles})
+    return JSONResponse({"html": html, "next_cursor": next_cursor})
+
+
 @router.get("/profile/edit", response_class=HTMLResponse)
 async def edit_profile_form(request: Request, user=Depends(get_current_user)):
     return templates.TemplateResponse("edit_profile.html", {
@@ -309,11 +352,14 @@ async def update_profile(
     new_password: str = Form(...),
     user=Depends(get_current_user)
 ):
-    user_doc = await db["users"].find_one({"_id": user["_id"]})
+    # The session user has no password hash, so read just that from Mongo
+    user_doc = await db["users"].find_one({"_id": user["_id"]}, PASSWORD_PROJECTION)
     if not user_doc:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not verify_password(current_password, user_doc["password"]):
+    # The password is replaced below, so a rehash from verification is not needed
+    valid, _ = await verify_and_update_password(current_password, user_doc["password"])
+    if not valid:
         return templates.TemplateResponse("edit_profile.html", {
             "request": request,
             "user": user,
@@ -324,15 +370,16 @@ async def update_profile(
         {"_id": user["_id"]},
         {"$set": {
             "full_name": full_name,
-            "password": get_password_hash(new_password)
+            "password": await hash_password(new_password)
         }}
     )
+    await invalidate_user(user["_id"])
 
     return RedirectResponse("/dashboard", status_code=302)
 @router.get("/profile", response_class=HTMLResponse)
 async def profile_page(request: Request, user = Depends(get_current_user)):
-    # שולפים את המשתמש המלא (כבר יש לכם קוד דומה)
-    user_doc = await db["users"].find_one({"_id": user["_id"]})
+    # get_current_user already loaded the full user document
+    user_doc = user
 
     # מכינים רשימת topics שכבר שמורים (ריק אם אין)
     selected_topics = user_doc.get("preferences", {}).get("topics", [])
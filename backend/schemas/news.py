@@ -8,6 +8,11 @@ class NewsSource(BaseModel):
     name: str
 
 
+class AlternateSource(BaseModel):
+    name: str
+    url: HttpUrl
+
+
 class NewsArticle(BaseModel):
     source: NewsSource
     author: Optional[str]
@@ -17,12 +22,16 @@ class NewsArticle(BaseModel):
     urlToImage: Optional[HttpUrl]
     publishedAt: datetime
     content: Optional[str]
-    summary: Optional[str]  # ✅ נדרש עבור dashboard + /me/news
+    summary: Optional[str] = None  # ✅ נדרש עבור dashboard + /me/news
+    # Other sources carrying the same story (near-duplicates dropped from the feed)
+    alternates: List[AlternateSource] = []
 
 
 class FilteredNewsResult(BaseModel):
     total: int
     articles: List[NewsArticle]
+    # Pass back as ?cursor= for the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 class SummarizedArticle(BaseModel):
@@ -3,13 +3,13 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from backend.routers.auth import get_current_user
-from openai import OpenAI
+from openai import OpenAIError, RateLimitError
 import os
 import redis.asyncio as redis
-from backend.core.config import REDIS_URL, OPENAI_API_KEY
+from backend.core.config import REDIS_URL
+from backend.services.llm_gateway import INTERACTIVE, LLMNotConfiguredError, llm_gateway
 
 router = APIRouter()
-openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
 
 class AIRequest(BaseModel):
@@ -24,15 +24,13 @@ redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
 
 
 @router.post("/ai/ask", response_model=AIResponse)
-def ask_openai(
+async def ask_openai(
     payload: AIRequest,
     current_user: dict = Depends(get_current_user)
 ):
-    if not openai_client:
-        raise HTTPException(status_code=500, detail="OpenAI not configured")
-        
     try:
-        response = openai_client.chat.completions.create(
+        response = await llm_gateway.complete(
+            INTERACTIVE,
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "אתה עוזר אינטיליגנטי בעברית."},
@@ -42,6 +40,11 @@ def ask_openai(
             max_tokens=300,
         )
         return {"answer": response.choices[0].message.content.strip()}
-    except Exception as e:
+    except LLMNotConfiguredError:
+        raise HTTPException(status_code=500, detail="OpenAI not configured")
+    except RateLimitError:
+        # Still rate limited after the gateway's retries
+        raise HTTPException(status_code=503, detail="AI service is busy, please try again shortly")
+    except OpenAIError as e:
         print(f"❌ OpenAI Error in ai service: {e}")
-        raise HTTPException(status_code=500, detail=f"OpenAI Error: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"OpenAI Error: {str(e)}")
@@ -0,0 +1,80 @@
+# backend/services/article_parsing.py
+"""
+Parsing of NewsData.io results into NewsArticle objects.
+
+Shared by the news router (live NewsData.io pages) and the ingestion worker
+(article store), so it raises ArticleParseError instead of an HTTP error;
+the router maps it to a 500 response.
+"""
+import re
+from datetime import datetime
+from typing import List
+
+from backend.schemas.news import NewsArticle, NewsSource
+from backend.utils.topic_matcher import get_matcher
+
+_ENGLISH_RE = re.compile(r"[a-zA-Z0-9\s\.,!?\"'\-:;()/@]+")
+
+
+class ArticleParseError(Exception):
+    """A NewsData.io response could not be turned into articles."""
+
+
+def looks_english(text: str) -> bool:
+    """Whether text only uses characters of plain English prose."""
+    return _ENGLISH_RE.fullmatch(text.strip()) is not None
+
+
+def article_text(article: NewsArticle) -> str:
+    """Title, description and content of an article, for topic matching."""
+    return f"{article.title} {article.description or ''} {article.content or ''}"
+
+
+def relevant_to_user(article: NewsArticle, interests: list[str]) -> bool:
+    """Whether the article mentions any of the interests."""
+    return get_matcher(interests).matches(article_text(article))
+
+
+def matched_topics(article: NewsArticle, interests: list[str]) -> set[str]:
+    """The interests the article mentions."""
+    return get_matcher(interests).find(article_text(article))
+
+
+def parse_articles(raw: dict, interests: list[str]) -> List[NewsArticle]:
+    """
+    Turn a NewsData.io response into the English articles matching the interests.
+
+    Args:
+        raw (dict): NewsData.io response (articles under "results")
+        interests (list[str]): Topics an article must mention to be kept
+
+    Returns:
+        List[NewsArticle]: Parsed articles, in response order
+
+    Raises:
+        ArticleParseError: If a result is missing required fields or is malformed
+    """
+    try:
+        articles = []
+        # Compiled once per topic set and reused across calls
+        matcher = get_matcher(interests)
+        # NewsData.io returns results in 'results' field, not 'articles'
+        for a in raw.get("results", []):
+            combined = f"{a.get('title', '')} {a.get('description', '')}"
+            if not looks_english(combined):
+                continue
+            parsed = NewsArticle(
+                source=NewsSource(id=a.get("source_id", "unknown"), name=a.get("source_id", "Unknown")),
+                author=a.get("creator", [None])[0] if a.get("creator") else None,
+                title=a["title"],
+                description=a.get("description"),
+                url=a["link"],
+                urlToImage=a.get("image_url"),
+                publishedAt=datetime.fromisoformat(a["pubDate"].replace("Z", "+00:00")) if a.get("pubDate") else datetime.now(),
+                content=a.get("content"),
+            )
+            if matcher.matches(article_text(parsed)):
+                articles.append(parsed)
+        return articles
+    except Exception as e:
+        raise ArticleParseError(f"Failed to parse news data: {e}") from e
@@ -0,0 +1,92 @@
+# backend/services/article_store.py
+"""
+Local article store backed by the `articles` collection.
+
+The ingestion worker upserts parsed NewsData.io articles here, tagged with the
+(lower-cased) topics they were fetched for. Feeds are then read from Mongo
+instead of calling NewsData.io on every page view.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from backend.core.config import ARTICLE_RETENTION_DAYS
+from backend.db.mongo import db
+from backend.schemas.news import NewsArticle
+
+articles_collection = db["articles"]
+
+
+async def ensure_article_indexes() -> None:
+    """Create the indexes used by ingestion and feed queries."""
+    await articles_collection.create_index([("url", ASCENDING)], unique=True)
+    await articles_collection.create_index(
+        [("topics", ASCENDING), ("language", ASCENDING), ("publishedAt", DESCENDING)]
+    )
+    # Expire articles some time after they were first ingested
+    await articles_collection.create_index(
+        [("ingested_at", ASCENDING)],
+        expireAfterSeconds=int(timedelta(days=ARTICLE_RETENTION_DAYS).total_seconds()),
+    )
+
+
+def _to_document(article: NewsArticle) -> dict:
+    doc = article.model_dump(mode="json", exclude={"summary", "alternates"})
+    # Keep a real date so Mongo can sort on it
+    doc["publishedAt"] = article.publishedAt
+    return doc
+
+
+async def upsert_articles(
+    articles: List[Tuple[NewsArticle, Iterable[str]]],
+    language: str = "en",
+) -> int:
+    """
+    Insert or update articles, adding the topics each one belongs to.
+
+    Args:
+        articles (List[Tuple[NewsArticle, Iterable[str]]]): Parsed articles
+            with the topics they matched
+        language (str): Language the articles were fetched in
+
+    Returns:
+        int: Number of newly inserted articles
+    """
+    if not articles:
+        return 0
+
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"url": str(article.url)},
+            {
+                "$set": {**_to_document(article), "language": language, "updated_at": now},
+                "$addToSet": {"topics": {"$each": sorted({t.strip().lower() for t in topics})}},
+                "$setOnInsert": {"ingested_at": now},
+            },
+            upsert=True,
+        )
+        for article, topics in articles
+    ]
+    result = await articles_collection.bulk_write(operations, ordered=False)
+    return result.upserted_count
+
+
+async def find_articles(topics: List[str], limit: int = 10, language: str = "en") -> List[NewsArticle]:
+    """
+    Return the most recent stored articles for any of the given topics.
+
+    Args:
+        topics (List[str]): Topics to match (case-insensitive)
+        limit (int): Maximum number of articles to return
+        language (str): Article language code
+
+    Returns:
+        List[NewsArticle]: Articles sorted by publishedAt, newest first
+    """
+    query = {
+        "topics": {"$in": [t.strip().lower() for t in topics]},
+        "language": language,
+    }
+    cursor = articles_collection.find(query, {"_id": 0}).sort("publishedAt", DESCENDING).limit(limit)
+    return [NewsArticle(**doc) async for doc in cursor]
@@ -0,0 +1,115 @@
+# backend/services/extractive.py
+"""
+Local extractive summarizer (TextRank), used as the fast summary tier.
+
+The text is split into sentences. Each sentence becomes a hashed term vector
+(sublinear TF x IDF over the article's sentences, L2-normalized, as in
+services/ranking.py), and sentences are ranked by PageRank over their
+cosine-similarity graph, with a bonus for sentences close to the headline
+and for the lead sentences news articles front-load. The best
+LOCAL_SUMMARY_SENTENCES are returned in their original order.
+
+Runs in about a millisecond or less for an article-sized text and needs
+neither the network nor a model; services/summarizer.py decides per article
+whether this or the LLM is used.
+"""
+import re
+from typing import List, Optional
+
+import numpy as np
+from backend.core.config import LOCAL_SUMMARY_MAX_CHARS, LOCAL_SUMMARY_SENTENCES
+from backend.services.ranking import term_matrix
+from backend.utils.metrics import stage
+
+# A sentence ends at . ! ? or an ellipsis followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"'”’)]*\s+")
+# Shorter fragments ("Read more.", bylines) are not used as sentences
+MIN_SENTENCE_CHARS = 20
+DAMPING = 0.85
+ITERATIONS = 30
+# Extra weight of the first sentence (halving for each following one)
+LEAD_BONUS = 0.5
+# Extra weight per unit of cosine similarity with the headline
+TITLE_BONUS = 0.5
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, dropping fragments shorter than MIN_SENTENCE_CHARS."""
+    sentences = [s.strip() for s in _SENTENCE_END.split(text.strip())]
+    return [s for s in sentences if len(s) >= MIN_SENTENCE_CHARS]
+
+
+def _normalized(matrix: np.ndarray) -> np.ndarray:
+    np.log1p(matrix, out=matrix)
+    n = matrix.shape[0]
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-9)
+    return matrix
+
+
+def rank_sentences(sentences: List[str], title: Optional[str] = None) -> np.ndarray:
+    """
+    Score sentences with TextRank plus lead and headline bonuses.
+
+    Args:
+        sentences (List[str]): Sentences in document order
+        title (Optional[str]): Headline, favouring sentences about the same thing
+
+    Returns:
+        np.ndarray: One score per sentence (higher is better)
+    """
+    n = len(sentences)
+    vectors = _normalized(term_matrix(sentences + [title] if title else sentences))
+    headline = vectors[n] if title else None
+    vectors = vectors[:n]
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no terms with the others link to every sentence evenly
+    transition = np.where(out_weight > 0, similarity / np.maximum(out_weight, 1e-9), 1.0 / n)
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(ITERATIONS):
+        scores = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+
+    scores *= 1 + LEAD_BONUS * 0.5 ** np.arange(n)
+    if headline is not None:
+        scores *= 1 + TITLE_BONUS * (vectors @ headline)
+    return scores
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:") + "..."
+
+
+def extractive_summary(
+    text: str,
+    title: Optional[str] = None,
+    max_sentences: int = LOCAL_SUMMARY_SENTENCES,
+    max_chars: int = LOCAL_SUMMARY_MAX_CHARS,
+) -> str:
+    """
+    Summarize text by picking its most central sentences.
+
+    Args:
+        text (str): Article text (description or content), without the headline
+        title (Optional[str]): Headline, used to bias the choice of sentences
+        max_sentences (int): Number of sentences to keep
+        max_chars (int): Length limit of the summary
+
+    Returns:
+        str: The selected sentences in document order, or the start of the
+        text if it has no usable sentences
+    """
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences:
+        return _truncate(" ".join(sentences) or text.strip(), max_chars)
+
+    with stage("extractive"):
+        scores = rank_sentences(sentences, title)
+    best = np.sort(np.argsort(-scores, kind="stable")[:max_sentences])
+    return _truncate(" ".join(sentences[i] for i in best), max_chars)
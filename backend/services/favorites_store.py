@@ -0,0 +1,181 @@
+# backend/services/favorites_store.py
+"""
+Saved articles, one document per (user, article) in the `favorites` collection.
+
+Favorites used to live in an embedded array on the user document; that array
+was rewritten on every add/remove and grew every user fetch. Each user now
+keeps only a `favorites_count` counter and a `favorites_version` (used in
+the favorites page ETag), updated here whenever a favorite is actually
+inserted or deleted. The favorites page is read in pages, newest
+first, with a keyset cursor on (saved_at, _id).
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from backend.db.mongo import db
+from backend.utils import pagination
+
+favorites_collection = db["favorites"]
+
+# Public fields of a favorite, as rendered by favorites.html
+FAVORITE_PROJECTION = {"url": 1, "title": 1, "source": 1, "published": 1, "saved_at": 1}
+
+
+async def ensure_favorite_indexes() -> None:
+    """Create the indexes used by favorites writes and page reads."""
+    # One favorite per article per user; add/remove look up by URL
+    await favorites_collection.create_index(
+        [("user_id", ASCENDING), ("url", ASCENDING)], unique=True, name="user_url_unique"
+    )
+    # Newest-first pages; _id breaks ties between equal saved_at values
+    await favorites_collection.create_index(
+        [("user_id", ASCENDING), ("saved_at", DESCENDING), ("_id", DESCENDING)],
+        name="user_saved_at",
+    )
+
+
+def encode_cursor(favorite: dict) -> str:
+    """Return an opaque cursor pointing just after the given favorite."""
+    return pagination.encode_cursor({"t": favorite["saved_at"].isoformat(), "id": str(favorite["_id"])})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Parse a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        position = pagination.decode_cursor(cursor)
+        return datetime.fromisoformat(position["t"]), ObjectId(position["id"])
+    except Exception as e:
+        raise ValueError(f"Invalid favorites cursor: {cursor!r}") from e
+
+
+async def add_favorite(user_id: ObjectId, favorite: dict) -> bool:
+    """
+    Save an article for a user and bump the user's favorites_count.
+
+    Args:
+        user_id (ObjectId): Owner of the favorite
+        favorite (dict): url, title, source and published fields
+
+    Returns:
+        bool: True if the article was newly saved, False if it already was
+    """
+    res = await favorites_collection.update_one(
+        {"user_id": user_id, "url": favorite["url"]},
+        {"$setOnInsert": {**favorite, "user_id": user_id, "saved_at": datetime.utcnow()}},
+        upsert=True,
+    )
+    if res.upserted_id is None:
+        return False
+    await db["users"].update_one({"_id": user_id}, {"$inc": {"favorites_count": 1, "favorites_version": 1}})
+    return True
+
+
+async def remove_favorite(user_id: ObjectId, url: str) -> bool:
+    """
+    Remove a saved article and decrement the user's favorites_count.
+
+    Args:
+        user_id (ObjectId): Owner of the favorite
+        url (str): URL of the saved article
+
+    Returns:
+        bool: True if a favorite was removed
+    """
+    res = await favorites_collection.delete_one({"user_id": user_id, "url": url})
+    if not res.deleted_count:
+        return False
+    await db["users"].update_one({"_id": user_id}, {"$inc": {"favorites_count": -1, "favorites_version": 1}})
+    return True
+
+
+async def list_favorites(
+    user_id: ObjectId,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Return one page of a user's favorites, newest first.
+
+    Args:
+        user_id (ObjectId): Owner of the favorites
+        limit (int): Page size
+        cursor (Optional[str]): Cursor returned with the previous page
+
+    Returns:
+        Tuple[List[dict], Optional[str]]: Favorites on this page and the
+            cursor for the next one (None on the last page)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = {"user_id": user_id}
+    if cursor:
+        saved_at, favorite_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"saved_at": {"$lt": saved_at}},
+            {"saved_at": saved_at, "_id": {"$lt": favorite_id}},
+        ]
+
+    # Fetch one extra document to learn whether another page exists
+    docs = await (
+        favorites_collection.find(query, FAVORITE_PROJECTION)
+        .sort([("saved_at", DESCENDING), ("_id", DESCENDING)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+
+async def migrate_embedded_favorites() -> int:
+    """
+    Move favorites arrays from user documents into the favorites collection.
+
+    Idempotent: favorites are upserted by (user_id, url), favorites_count is
+    recomputed from the collection, and the array is only unset afterwards, so
+    an interrupted run can simply be repeated. Array order is kept by spacing
+    saved_at one millisecond apart (the last element is the newest).
+
+    Returns:
+        int: Number of users migrated
+    """
+    users = db["users"]
+    migrated = 0
+
+    async for user in users.find({"favorites": {"$exists": True}}, {"favorites": 1}):
+        user_id = user["_id"]
+        favorites = [f for f in user.get("favorites") or [] if isinstance(f, dict) and f.get("url")]
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"user_id": user_id, "url": fav["url"]},
+                {"$setOnInsert": {
+                    "user_id": user_id,
+                    "url": fav["url"],
+                    "title": fav.get("title", ""),
+                    "source": fav.get("source", ""),
+                    "published": fav.get("published", ""),
+                    "saved_at": now - timedelta(milliseconds=len(favorites) - index),
+                }},
+                upsert=True,
+            )
+            for index, fav in enumerate(favorites)
+        ]
+        if operations:
+            await favorites_collection.bulk_write(operations, ordered=False)
+
+        count = await favorites_collection.count_documents({"user_id": user_id})
+        await users.update_one(
+            {"_id": user_id},
+            {"$set": {"favorites_count": count}, "$unset": {"favorites": ""}},
+        )
+        migrated += 1
+
+    return migrated
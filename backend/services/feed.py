@@ -0,0 +1,304 @@
+# backend/services/feed.py
+"""
+Materialized per-user dashboard feeds.
+
+A user's feed is the de-duplicated, ranked list of stored articles for their
+topics, capped at FEED_MAX_LENGTH entries and kept in a TieredCache (Redis
+when available), so a dashboard view is a single cache read plus a template
+render.
+
+Feeds are rebuilt:
+- after each ingestion cycle, for active users whose topics received new
+  articles (refresh_feeds);
+- on the next dashboard view after the user's preferences change
+  (invalidate_feed), or after the entry expired.
+
+Each stored feed carries a version, changed on every rebuild; the dashboard
+ETag is derived from it.
+
+The dashboard reads the feed a page at a time (feed_page): the cursor is an
+offset into the materialized feed or, while the store has nothing for the
+user's topics, a position in NewsData.io's result pages (nextPage token).
+
+Users count as active for FEED_ACTIVE_DAYS after their last dashboard view
+(`last_seen_at`, written at most once per ACTIVITY_RESOLUTION). Feeds of
+inactive users are no longer refreshed and expire after FEED_TTL_SECONDS.
+An ingestion cycle rebuilds at most FEED_REFRESH_MAX_USERS feeds and drops
+the other affected ones.
+
+De-duplication and ranking are CPU-bound (tens of milliseconds per feed), so
+builds run them in a small thread pool instead of on the event loop.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from backend.core.config import (
+    DEDUP_ENABLED,
+    DEDUP_SIMILARITY,
+    FEED_ACTIVE_DAYS,
+    FEED_CACHE_ENABLED,
+    FEED_CACHE_MAX_USERS,
+    FEED_LOCAL_TTL_SECONDS,
+    FEED_MAX_LENGTH,
+    FEED_REFRESH_CONCURRENCY,
+    FEED_REFRESH_MAX_USERS,
+    FEED_TTL_SECONDS,
+    NEWS_API_KEY,
+    RANKING_ENABLED,
+)
+from backend.db.mongo import db
+from backend.external.news_api import fetch_news_page
+from backend.models.user import SESSION_PROJECTION
+from backend.schemas.news import NewsArticle
+from backend.services.article_store import find_articles
+from backend.services.ranking import candidate_pool_size, interest_profile, parse_published, top_k
+from backend.services.user_cache import invalidate_user
+from backend.utils.cache import TieredCache
+from backend.utils.concurrency import SingleFlight, gather_limited
+from backend.utils.dedup import dedupe
+from backend.utils.pagination import decode_cursor, encode_cursor
+
+# How stale last_seen_at may get before a dashboard view updates it
+ACTIVITY_RESOLUTION = timedelta(hours=1)
+# Stored content is only used as summarizer input, which reads 1000 characters
+CONTENT_LIMIT = 1000
+
+# Rebuilds and invalidations reach other workers within FEED_LOCAL_TTL_SECONDS
+feed_cache = TieredCache(
+    "feed",
+    maxsize=FEED_CACHE_MAX_USERS,
+    ttl=FEED_TTL_SECONDS,
+    local_ttl=FEED_LOCAL_TTL_SECONDS,
+)
+_builds = SingleFlight()
+# Runs select_entries off the event loop
+_select_executor = ThreadPoolExecutor(max_workers=FEED_REFRESH_CONCURRENCY, thread_name_prefix="feed-select")
+
+
+def stored_to_newsdata(article: NewsArticle) -> dict:
+    """Convert a stored article to the NewsData.io field names used by the dashboard."""
+    return {
+        "title": article.title,
+        "description": article.description,
+        "content": (article.content or "")[:CONTENT_LIMIT],
+        "source_id": article.source.name,
+        "pubDate": article.publishedAt.isoformat(),
+        "link": str(article.url),
+    }
+
+
+def _headline(a: dict) -> str:
+    return f"{a.get('title') or ''} {a.get('description') or ''}"
+
+
+def select_entries(results: List[dict], limit: int, profile: Sequence[Tuple[str, float]]) -> List[dict]:
+    """
+    De-duplicate and rank NewsData.io-style articles into feed entries.
+
+    Args:
+        results (List[dict]): Candidate articles (NewsData.io field names)
+        limit (int): Number of entries to keep
+        profile (Sequence[Tuple[str, float]]): Interest profile used for ranking
+
+    Returns:
+        List[dict]: Best articles first, each with an "alternates" list of
+        {"source", "url"} for the near-duplicates it stands for
+    """
+    # Collapse the same story from several sources (or several topics)
+    if DEDUP_ENABLED:
+        clusters = dedupe(results, _headline, DEDUP_SIMILARITY)
+    else:
+        clusters = [(a, []) for a in results]
+
+    if RANKING_ENABLED:
+        clusters = top_k(
+            clusters,
+            limit,
+            lambda c: _headline(c[0]),
+            lambda c: parse_published(c[0].get("pubDate")),
+            profile,
+        )
+    else:
+        clusters = clusters[:limit]
+
+    return [
+        {
+            **a,
+            "alternates": [
+                {"source": d.get("source_id", "Unknown"), "url": d.get("link", "#")}
+                for d in duplicates
+            ],
+        }
+        for a, duplicates in clusters
+    ]
+
+
+async def build_feed(user: dict, limit: int = FEED_MAX_LENGTH) -> List[dict]:
+    """
+    Build a user's feed from the article store.
+
+    Args:
+        user (dict): Session user (preferences.topics are used)
+        limit (int): Number of entries to keep
+
+    Returns:
+        List[dict]: Feed entries (see select_entries); empty if the store has
+        nothing for the user's topics or is unavailable
+    """
+    topics = user.get("preferences", {}).get("topics") or []
+    if not topics:
+        return []
+    try:
+        stored = await find_articles(topics, candidate_pool_size(limit))
+    except Exception as e:
+        print(f"[WARNING] Article store unavailable: {e}")
+        return []
+    results = [stored_to_newsdata(a) for a in stored]
+    profile = await interest_profile(user, topics) if RANKING_ENABLED else []
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_select_executor, select_entries, results, limit, profile)
+
+
+async def _build_and_store(user: dict) -> dict:
+    feed = {"version": f"{time.time_ns():x}", "entries": await build_feed(user)}
+    if feed["entries"]:
+        await feed_cache.set(str(user["_id"]), feed)
+    return feed
+
+
+async def get_feed(user: dict) -> Tuple[List[dict], Optional[str]]:
+    """
+    Return the user's materialized feed, building it on a miss.
+
+    Args:
+        user (dict): Session user
+
+    Returns:
+        Tuple[List[dict], Optional[str]]: Up to FEED_MAX_LENGTH entries, best
+        first, and the feed version (no entries and None if the article store
+        has nothing for the user yet)
+    """
+    key = str(user["_id"])
+    feed = await feed_cache.get(key)
+    # None, or a plain entry list cached before feeds were versioned
+    if not isinstance(feed, dict):
+        # Concurrent views of the same user share one build
+        feed = await _builds.do(key, lambda: _build_and_store(user))
+    if not feed["entries"]:
+        return [], None
+    return feed["entries"], feed["version"]
+
+
+async def feed_page(
+    user: dict,
+    size: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str], Optional[str]]:
+    """
+    Return one page of a user's feed.
+
+    Pages come from the materialized feed (built from the article store). If
+    the store has nothing for the user's topics yet, they come from
+    NewsData.io instead, following its nextPage tokens; those entries are
+    de-duplicated and ranked within their page.
+
+    Args:
+        user (dict): Session user
+        size (int): Number of entries wanted
+        cursor (Optional[str]): Cursor returned with the previous page (None: first page)
+
+    Returns:
+        Tuple[List[dict], Optional[str], Optional[str]]: The entries (see
+        select_entries), the cursor of the next page (None on the last one)
+        and the feed version (None for NewsData.io pages)
+
+    Raises:
+        ValueError: If the cursor is malformed
+        httpx.HTTPError, UpstreamUnavailable: If NewsData.io fails and no
+            cached copy exists
+    """
+    position = decode_cursor(cursor) if cursor else {"o": 0}
+    if "p" not in position:
+        offset = position.get("o")
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError(f"Invalid feed cursor: {cursor!r}")
+        if FEED_CACHE_ENABLED:
+            entries, version = await get_feed(user)
+        else:
+            # One extra entry tells whether there is a next page
+            entries, version = await build_feed(user, min(offset + size + 1, FEED_MAX_LENGTH)), None
+        page = entries[offset:offset + size]
+        if page or offset or not NEWS_API_KEY:
+            # A feed rebuilt between two pages may repeat or skip an entry at the boundary
+            next_cursor = encode_cursor({"o": offset + size}) if len(entries) > offset + size else None
+            return page, next_cursor, version
+        position = {"p": None, "s": 0}
+
+    page_token, skip = position.get("p"), position.get("s", 0)
+    if not isinstance(skip, int) or skip < 0 or not (page_token is None or isinstance(page_token, str)):
+        raise ValueError(f"Invalid feed cursor: {cursor!r}")
+    topics = user.get("preferences", {}).get("topics") or []
+    results, following = await fetch_news_page(topics, "en", size, page_token, skip)
+    profile = await interest_profile(user, topics) if RANKING_ENABLED else []
+    next_cursor = encode_cursor({"p": following[0], "s": following[1]}) if following else None
+    return select_entries(results, size, profile), next_cursor, None
+
+
+async def invalidate_feed(user_id) -> None:
+    """Drop a user's feed, e.g. after their topics changed."""
+    await feed_cache.delete(str(user_id))
+
+
+async def mark_active(user: dict) -> None:
+    """Record a dashboard view, so the user's feed is kept fresh on ingest."""
+    if user["_id"] == "test_user_id":
+        return
+    now = datetime.utcnow()
+    last_seen = user.get("last_seen_at")
+    if isinstance(last_seen, datetime) and now - last_seen < ACTIVITY_RESOLUTION:
+        return
+    await db["users"].update_one({"_id": user["_id"]}, {"$set": {"last_seen_at": now}})
+    await invalidate_user(user["_id"])
+
+
+async def refresh_feeds(topics: Iterable[str]) -> int:
+    """
+    Rebuild the feeds of active users subscribed to any of the given topics.
+
+    The FEED_REFRESH_MAX_USERS most recently active of them are rebuilt; the
+    feeds of the others are dropped, so their next view builds a fresh one.
+
+    Args:
+        topics (Iterable[str]): Topics that received new articles (any case)
+
+    Returns:
+        int: Number of feeds rebuilt
+    """
+    fresh = {t.strip().lower() for t in topics if t}
+    if not fresh:
+        return 0
+
+    cutoff = datetime.utcnow() - timedelta(days=FEED_ACTIVE_DAYS)
+    users, stale = [], []
+    active = db["users"].find({"last_seen_at": {"$gte": cutoff}}, SESSION_PROJECTION).sort("last_seen_at", -1)
+    async for user in active:
+        # Stored topics keep the user's casing; ingestion topics are lower-case
+        user_topics = {t.strip().lower() for t in user.get("preferences", {}).get("topics") or []}
+        if user_topics & fresh:
+            (users if len(users) < FEED_REFRESH_MAX_USERS else stale).append(user)
+
+    if stale:
+        await asyncio.gather(*(invalidate_feed(u["_id"]) for u in stale), return_exceptions=True)
+
+    results = await gather_limited(
+        FEED_REFRESH_CONCURRENCY,
+        [lambda u=u: _build_and_store(u) for u in users],
+        return_exceptions=True,
+    )
+    failed = [r for r in results if isinstance(r, Exception)]
+    if failed:
+        print(f"[WARNING] {len(failed)} feed refreshes failed, e.g.: {failed[0]}")
+    return len(users) - len(failed)
@@ -0,0 +1,182 @@
+# backend/services/ingestion.py
+"""
+Background ingestion worker.
+
+Periodically collects the distinct topics from all users' preferences,
+fetches each one from NewsData.io (paced to stay under the API rate limit)
+and upserts the parsed articles into the local article store. Feeds of active
+users subscribed to topics that received new articles are then rebuilt.
+
+Every app worker starts the loop, but only the one holding the ingestion
+lease (a document in the `leases` collection) runs cycles, so NewsData.io is
+polled once per interval however many workers serve the app. The holder
+renews the lease before each topic; if it dies, another worker takes over
+once the lease has expired (INGEST_LEASE_SECONDS).
+"""
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+from backend.core.config import (
+    INGEST_INTERVAL_SECONDS,
+    INGEST_LEASE_SECONDS,
+    INGEST_REQUESTS_PER_MINUTE,
+    NEWS_API_KEY,
+)
+from backend.db.mongo import db
+from backend.external.news_api import request_news
+from backend.services.article_parsing import matched_topics, parse_articles
+from backend.services.article_store import upsert_articles
+from backend.services.feed import refresh_feeds
+
+leases_collection = db["leases"]
+LEASE_ID = "ingestion"
+# Identifies this process as the lease holder
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_worker_task: Optional[asyncio.Task] = None
+
+
+async def acquire_lease() -> bool:
+    """
+    Take or renew the ingestion lease for INGEST_LEASE_SECONDS.
+
+    Returns:
+        bool: True if this worker holds the lease, False if another worker
+        holds an unexpired one
+    """
+    now = datetime.utcnow()
+    try:
+        # Matches only our own or an expired lease; otherwise the upsert
+        # collides with the holder's document
+        await leases_collection.update_one(
+            {"_id": LEASE_ID, "$or": [{"holder": WORKER_ID}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"holder": WORKER_ID, "expires_at": now + timedelta(seconds=INGEST_LEASE_SECONDS)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def release_lease() -> None:
+    """Give the ingestion lease up if this worker holds it."""
+    await leases_collection.delete_one({"_id": LEASE_ID, "holder": WORKER_ID})
+
+
+async def collect_topics() -> list[str]:
+    """
+    Return the distinct topics subscribed to by any user.
+
+    Returns:
+        list[str]: Lower-cased, de-duplicated topics in sorted order
+    """
+    topics = await db["users"].distinct("preferences.topics")
+    return sorted({t.strip().lower() for t in topics if isinstance(t, str) and t.strip()})
+
+
+async def ingest_topic(topic: str, all_topics: list[str], language: str = "en") -> int:
+    """
+    Fetch one topic from NewsData.io and store the parsed articles.
+
+    Each article is tagged with the fetched topic plus every other subscribed
+    topic it mentions, so it shows up in those feeds too.
+
+    Args:
+        topic (str): Topic to fetch
+        all_topics (list[str]): All subscribed topics
+        language (str): Article language code
+
+    Returns:
+        int: Number of newly inserted articles
+    """
+    raw = await request_news([topic], language, 10)
+    articles = parse_articles(raw, [topic])
+    tagged = [(article, matched_topics(article, all_topics) | {topic}) for article in articles]
+    return await upsert_articles(tagged, language)
+
+
+async def run_ingestion_cycle(leased: bool = False) -> int:
+    """
+    Ingest every subscribed topic once, then refresh the affected feeds.
+
+    Requests are spaced so that no more than INGEST_REQUESTS_PER_MINUTE calls
+    reach NewsData.io. A failing topic is logged and skipped.
+
+    Args:
+        leased (bool): Renew the ingestion lease before each topic and stop
+            the cycle if another worker took it over
+
+    Returns:
+        int: Total number of newly inserted articles
+    """
+    topics = await collect_topics()
+    delay = 60.0 / max(1, INGEST_REQUESTS_PER_MINUTE)
+    inserted = 0
+    fresh_topics = set()
+
+    for index, topic in enumerate(topics):
+        if index:
+            await asyncio.sleep(delay)
+        if leased and not await acquire_lease():
+            print("[WARNING] Ingestion lease lost, stopping the cycle")
+            break
+        try:
+            count = await ingest_topic(topic, topics)
+        except Exception as e:
+            print(f"[WARNING] Ingestion failed for topic '{topic}': {e}")
+            continue
+        inserted += count
+        if count:
+            fresh_topics.add(topic)
+
+    refreshed = await refresh_feeds(fresh_topics)
+    print(f"[OK] Ingestion cycle done: {len(topics)} topics, {inserted} new articles, {refreshed} feeds refreshed")
+    return inserted
+
+
+async def _ingestion_loop() -> None:
+    while True:
+        try:
+            if await acquire_lease():
+                await run_ingestion_cycle(leased=True)
+        except Exception as e:
+            print(f"[ERROR] Ingestion cycle failed: {e}")
+        await asyncio.sleep(INGEST_INTERVAL_SECONDS)
+
+
+def start_ingestion_worker() -> None:
+    """
+    Start the ingestion loop in the background (no-op without NEWS_API_KEY).
+
+    Safe to call in every app worker: the loop only runs cycles while this
+    worker holds the ingestion lease.
+    """
+    global _worker_task
+    if not NEWS_API_KEY:
+        print("[WARNING] NEWS_API_KEY missing - ingestion worker not started")
+        return
+    if _worker_task is None or _worker_task.done():
+        _worker_task = asyncio.create_task(_ingestion_loop())
+
+
+async def stop_ingestion_worker() -> None:
+    """Cancel the ingestion loop, wait for it to finish and release the lease."""
+    global _worker_task
+    if _worker_task is None:
+        return
+    _worker_task.cancel()
+    try:
+        await _worker_task
+    except asyncio.CancelledError:
+        pass
+    _worker_task = None
+    # Let another worker take over at its next attempt instead of after expiry
+    try:
+        await release_lease()
+    except Exception as e:
+        print(f"[WARNING] Could not release the ingestion lease: {e}")
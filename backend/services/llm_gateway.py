@@ -0,0 +1,266 @@
+# backend/services/llm_gateway.py
+"""
+Rate-limit-aware gateway for OpenAI chat completions.
+
+Every LLM call goes through llm_gateway.complete(), which:
+
+- waits for a requests-per-minute and a tokens-per-minute token bucket
+  (OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT) before sending, so bursts of
+  dashboard loads queue briefly instead of triggering 429 storms;
+- serves waiting callers in priority order: INTERACTIVE calls (a user is
+  waiting on the page) always go ahead of BACKGROUND work;
+- on 429 honours Retry-After, pausing all callers for that long, and retries
+  429/5xx/connection errors with jittered exponential backoff;
+- sends through llm_upstream (utils/resilience.py): each attempt gets an
+  adaptive timeout, and while the breaker is open calls fail at once with
+  CircuitOpenError, before taking a place in the queue.
+
+The OpenAI client's own retries are disabled (see get_openai_client) so a
+failed call is retried here, in priority order, only.
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+
+from openai import APIConnectionError, APIStatusError, RateLimitError
+from backend.core.config import (
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_MAX_RETRIES,
+    OPENAI_RPM_LIMIT,
+    OPENAI_SLOW_CALL_SECONDS,
+    OPENAI_TIMEOUT_MIN_SECONDS,
+    OPENAI_TIMEOUT_SECONDS,
+    OPENAI_TPM_LIMIT,
+)
+from backend.utils.http_client import get_openai_client
+from backend.utils.metrics import stage
+from backend.utils.resilience import Upstream, UpstreamTimeoutError
+
+# Lower value = served first
+INTERACTIVE = 0
+BACKGROUND = 10
+
+
+class LLMNotConfiguredError(RuntimeError):
+    """Raised when a completion is requested without OPENAI_API_KEY."""
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket.
+
+    The level may go negative when actual usage exceeds what was reserved;
+    later callers then wait for the debt to be paid back.
+
+    Args:
+        capacity (float): Maximum number of tokens (the per-minute budget)
+        per_second (float): Refill rate
+    """
+
+    def __init__(self, capacity: float, per_second: float):
+        self.capacity = capacity
+        self.per_second = per_second
+        self._level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._level >= amount:
+            return 0.0
+        return (amount - self._level) / self.per_second
+
+    def take(self, amount: float) -> None:
+        """Remove tokens (negative amounts give tokens back)."""
+        self._refill()
+        self._level = min(self.capacity, self._level - amount)
+
+
+def estimate_tokens(messages: List[dict], max_tokens: Optional[int]) -> int:
+    """Rough token cost of a request: ~4 characters per token plus the completion budget."""
+    prompt = sum(len(str(m.get("content", ""))) for m in messages) // 4 + 4 * len(messages)
+    return prompt + (max_tokens or 256)
+
+
+def _retry_after(error: APIStatusError) -> Optional[float]:
+    """Parse Retry-After (seconds or HTTP date) or OpenAI's retry-after-ms header."""
+    headers = error.response.headers if error.response is not None else {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RateLimitError, APIConnectionError, UpstreamTimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _counts_against_upstream(error: BaseException) -> bool:
+    # 429s are our own budget (handled by the buckets and Retry-After); other
+    # 4xx are bad requests
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500
+    return True
+
+
+llm_upstream = Upstream(
+    "openai",
+    min_timeout=OPENAI_TIMEOUT_MIN_SECONDS,
+    max_timeout=OPENAI_TIMEOUT_SECONDS,
+    slow_call_seconds=OPENAI_SLOW_CALL_SECONDS,
+    is_failure=_counts_against_upstream,
+)
+
+
+class LLMGateway:
+    """
+    Priority scheduler in front of the OpenAI chat completions API.
+
+    Args:
+        requests_per_minute (int): Request budget
+        tokens_per_minute (int): Token budget (prompt + completion, estimated)
+        max_retries (int): Retries after a 429, 5xx or connection error
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_retries: int = LLM_MAX_RETRIES):
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.max_retries = max_retries
+        self._waiters: list = []
+        self._order = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        # Set from Retry-After: nobody is sent before this (monotonic) time
+        self._paused_until = 0.0
+        self.rate_limited = 0
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(
+            self._paused_until - time.monotonic(),
+            self._requests.wait_time(1),
+            self._tokens.wait_time(tokens),
+        )
+
+    def expected_wait(self, tokens: int, requests: int = 1) -> float:
+        """
+        Rough time before a new call would be sent, behind everyone already queued.
+
+        Args:
+            tokens (int): Estimated tokens of the new call(s)
+            requests (int): Number of new calls
+
+        Returns:
+            float: Seconds (0 if it would be sent right away)
+        """
+        queued = [w for w in self._waiters if not w[2].done()]
+        queued_tokens = sum(w[3] for w in queued) + tokens
+        queued_requests = len(queued) + requests
+        wait = max(
+            self._paused_until - time.monotonic(),
+            self._requests.wait_time(queued_requests),
+            self._tokens.wait_time(queued_tokens),
+        )
+        # wait_time caps the amount at one bucket: add the refill time of the excess
+        overflow = max(queued_requests / self._requests.capacity, queued_tokens / self._tokens.capacity)
+        return wait + 60 * max(0.0, overflow - 1)
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            _, _, future, tokens = self._waiters[0]
+            if future.done():
+                # Caller gave up (cancelled or timed out) while queued
+                heapq.heappop(self._waiters)
+                continue
+            wait = self._wait_time(tokens)
+            if wait > 0:
+                # Re-check the head afterwards: a higher-priority caller may have arrived
+                await asyncio.sleep(wait)
+                continue
+            heapq.heappop(self._waiters)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            future.set_result(None)
+
+    async def _acquire(self, tokens: int, priority: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future, tokens))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    def _backoff(self, error: Exception, attempt: int) -> float:
+        delay = min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt)
+        if isinstance(error, RateLimitError):
+            self.rate_limited += 1
+            retry_after = _retry_after(error)
+            if retry_after is not None:
+                delay = retry_after
+            # Hold back every caller, not just this one: the limit is per account
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        # Jitter so retries released together do not hit the API in lockstep
+        return delay + random.uniform(0, delay / 2)
+
+    async def complete(self, priority: int = INTERACTIVE, **kwargs):
+        """
+        Create a chat completion within the rate-limit budgets.
+
+        Args:
+            priority (int): INTERACTIVE or BACKGROUND (lower is served first)
+            **kwargs: Arguments for chat.completions.create (model, messages, ...)
+
+        Returns:
+            ChatCompletion: The OpenAI response
+
+        Raises:
+            LLMNotConfiguredError: If OPENAI_API_KEY is not set
+            CircuitOpenError: If the OpenAI breaker is (or becomes) open
+            openai.OpenAIError: If the call still fails after max_retries
+        """
+        client = get_openai_client()
+        if client is None:
+            raise LLMNotConfiguredError("OpenAI not configured")
+
+        estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        for attempt in range(self.max_retries + 1):
+            # Fail fast without spending rate budget while the breaker is open
+            llm_upstream.check()
+            await self._acquire(estimated, priority)
+            try:
+                with stage("llm"):
+                    response = await llm_upstream.call(lambda: client.chat.completions.create(**kwargs))
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                delay = self._backoff(e, attempt)
+                print(f"[WARNING] OpenAI call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            # Settle the token bucket with the real usage
+            usage = getattr(response, "usage", None)
+            if usage is not None and usage.total_tokens:
+                self._tokens.take(usage.total_tokens - estimated)
+            return response
+
+
+llm_gateway = LLMGateway(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
@@ -0,0 +1,477 @@
+# backend/services/summarizer.py
+"""
+Article summarization pipeline used by the dashboard.
+
+Summaries are generated with the async OpenAI client (sharing the application's
+HTTP connection pool) so that the event loop is never blocked while waiting on
+the LLM. Articles are summarized concurrently,
+bounded by SUMMARY_CONCURRENCY, and each call is capped by
+SUMMARY_TIMEOUT_SECONDS so one slow completion cannot hold up the whole page.
+
+Summaries are shared across users through a content-addressed cache keyed on
+article URL, a hash of the input text, language and model.
+
+Cache misses are packed into batches (bounded by SUMMARY_BATCH_SIZE and
+SUMMARY_BATCH_TOKEN_BUDGET) and summarized with one JSON-mode request per
+batch. Articles missing from a malformed batch reply are retried one by one.
+
+All completions go through the LLM gateway (services/llm_gateway.py), which
+enforces the account's rate limits and serves page loads (INTERACTIVE, the
+default) ahead of BACKGROUND work.
+
+choose_tier() picks the LLM or the local extractive summarizer
+(services/extractive.py) per article. Articles whose text is already one or
+two sentences are summarized locally without a cache lookup; cache misses
+also go local while OpenAI is not configured, its breaker is open or the
+gateway queue is too long. Local summaries are not cached, so the LLM
+summary replaces them once it is available again. LLM calls that time out,
+are refused by the breaker, are still rate limited after the gateway's
+retries or find no API key fall back to the local summary too.
+"""
+import asyncio
+import hashlib
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from backend.core.config import (
+    LOCAL_SUMMARY_ENABLED,
+    LOCAL_SUMMARY_MAX_LLM_WAIT_SECONDS,
+    LOCAL_SUMMARY_MAX_WORDS,
+    LOCAL_SUMMARY_SENTENCES,
+    OPENAI_SUMMARY_MODEL,
+    SUMMARY_BATCH_SIZE,
+    SUMMARY_BATCH_TIMEOUT_SECONDS,
+    SUMMARY_BATCH_TOKEN_BUDGET,
+    SUMMARY_BATCHING,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    SUMMARY_CACHE_TTL_SECONDS,
+    SUMMARY_CONCURRENCY,
+    SUMMARY_TIMEOUT_SECONDS,
+)
+from backend.services.extractive import extractive_summary, split_sentences
+from openai import RateLimitError
+from backend.services.llm_gateway import INTERACTIVE, LLMNotConfiguredError, llm_gateway, llm_upstream
+from backend.utils.cache import TieredCache
+from backend.utils.http_client import get_openai_client
+from backend.utils.metrics import SUMMARIES
+from backend.utils.resilience import UpstreamUnavailable
+
+DEFAULT_SYSTEM_PROMPT = "You are a news summarizer. Create a clear, engaging summary in 2-3 sentences. If the content is limited or incomplete, say 'Limited preview available - visit article for full details' instead of making up information."
+
+SYSTEM_PROMPTS = {
+    "he": "אתה מסכם חדשות בעברית בפשטות ובאופן מעניין.",
+    "fr": "Tu résumes les actualités en français de manière claire et intéressante.",
+    "es": "Resumes las noticias en español de forma clara y atractiva.",
+    "en": DEFAULT_SYSTEM_PROMPT,
+}
+
+BATCH_INSTRUCTIONS = (
+    "Summarize each of the following news articles separately. "
+    'Reply with a JSON object of the form {"summaries": {"<id>": "<summary>"}} '
+    "containing exactly one entry for every article id."
+)
+
+LIMITED_CONTENT = "Limited content available - visit link for full article"
+LIMITED_PREVIEW = "Limited preview available - visit article for full details"
+SUMMARY_UNAVAILABLE = "Summary unavailable - visit article for full details"
+
+# Summary tiers (see choose_tier)
+LOCAL = "local"
+LLM = "llm"
+# Completion budget of one article, as requested from the LLM
+SUMMARY_MAX_TOKENS = 100
+# The LLM could not be used for this call (breaker open or adaptive timeout,
+# rate limit still hit after the gateway's retries, no API key): the article
+# gets the local summary instead
+LLM_UNAVAILABLE = (UpstreamUnavailable, RateLimitError, LLMNotConfiguredError)
+
+summary_cache = TieredCache(
+    "summary",
+    maxsize=SUMMARY_CACHE_MAX_ENTRIES,
+    ttl=SUMMARY_CACHE_TTL_SECONDS,
+)
+
+
+def summary_cache_key(text: str, lang: str, model: str, url: Optional[str] = None) -> str:
+    """
+    Build the content-addressed cache key for a summary.
+
+    Args:
+        text (str): Input text sent to the model
+        lang (str): Target language of the summary
+        model (str): Model used to produce the summary
+        url (Optional[str]): Article URL, if known
+
+    Returns:
+        str: Hex digest identifying the (url, text, lang, model) combination
+    """
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    raw = "|".join([url or "", text_hash, lang, model])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _precheck(text: str) -> Optional[str]:
+    """Return a canned summary when the text should not be sent to the LLM."""
+    if not get_openai_client() and not LOCAL_SUMMARY_ENABLED:
+        return "OpenAI not configured"
+
+    # Check if content is meaningful
+    if len(text.strip()) < 30:
+        return "Not enough content to summarize"
+
+    # Check for limited content indicators
+    if "paid plans" in text.lower() or "premium content" in text.lower():
+        return "Full content requires premium access - check original article"
+
+    return None
+
+
+def _clean_summary(summary: str) -> str:
+    # Filter out unhelpful AI responses
+    if "cannot provide" in summary.lower() or "sorry" in summary.lower():
+        return LIMITED_PREVIEW
+    return summary
+
+
+def _body(item: dict) -> str:
+    # The routers send "<title>. <description or content>"; the headline is
+    # already on the page, so the local tier only picks from the rest
+    text, title = item.get("text", ""), item.get("title")
+    if title and text.startswith(title):
+        return text[len(title):].lstrip(". ")
+    return text
+
+
+def _is_short(item: dict) -> bool:
+    body = _body(item)
+    return len(body.split()) <= LOCAL_SUMMARY_MAX_WORDS and len(split_sentences(body)) <= LOCAL_SUMMARY_SENTENCES
+
+
+def _local_summary(item: dict) -> str:
+    body = _body(item)
+    if not body.strip():
+        return LIMITED_CONTENT
+    return extractive_summary(body, item.get("title"))
+
+
+def choose_tier(item: dict, queued_tokens: int = 0, queued_requests: int = 0) -> str:
+    """
+    Pick the tier that summarizes an article: LOCAL or LLM.
+
+    Local when the article text is at most LOCAL_SUMMARY_SENTENCES sentences
+    and LOCAL_SUMMARY_MAX_WORDS words (the LLM would mostly rephrase it), when
+    OpenAI is not configured or its breaker is open, and when the gateway
+    would make the call wait more than LOCAL_SUMMARY_MAX_LLM_WAIT_SECONDS.
+
+    Args:
+        item (dict): Article as passed to iter_summaries
+        queued_tokens (int): Estimated tokens of articles of the same page
+            already sent to the LLM tier
+        queued_requests (int): Number of those articles
+
+    Returns:
+        str: LOCAL or LLM
+    """
+    if not LOCAL_SUMMARY_ENABLED:
+        return LLM
+    # refusing() rather than is_open: once open_seconds have passed the
+    # half-open probe must be let through, or the breaker never closes again
+    if _is_short(item) or get_openai_client() is None or llm_upstream.breaker.refusing():
+        return LOCAL
+    cost = _estimate_tokens(item["text"][:1000]) + SUMMARY_MAX_TOKENS
+    if llm_gateway.expected_wait(queued_tokens + cost, queued_requests + 1) > LOCAL_SUMMARY_MAX_LLM_WAIT_SECONDS:
+        return LOCAL
+    return LLM
+
+
+async def _complete_single(text: str, lang: str, priority: int = INTERACTIVE) -> str:
+    system_prompt = SYSTEM_PROMPTS.get(lang, DEFAULT_SYSTEM_PROMPT)
+    response = await llm_gateway.complete(
+        priority,
+        model=OPENAI_SUMMARY_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Summarize this news content:\n\n{text[:1000]}"},
+        ],
+        temperature=0.3,  # Lower temperature for more factual summaries
+        max_tokens=SUMMARY_MAX_TOKENS,
+    )
+    return _clean_summary(response.choices[0].message.content.strip())
+
+
+def _fallback_summary(description: Optional[str]) -> str:
+    return description[:200] + "..." if description else "Summary not available"
+
+
+def _fallback(item: dict) -> str:
+    # Used when the LLM call timed out or the LLM was unavailable
+    SUMMARIES.labels("fallback").inc()
+    if LOCAL_SUMMARY_ENABLED:
+        return _local_summary(item)
+    return _fallback_summary(item.get("description"))
+
+
+def _estimate_tokens(text: str) -> int:
+    # Rough estimate: ~4 characters per token for English text
+    return len(text) // 4 + 1
+
+
+def _pack_batches(entries: List[Tuple[int, dict]]) -> List[List[Tuple[int, dict]]]:
+    """Greedily group entries into batches within the size and token budget."""
+    batches: List[List[Tuple[int, dict]]] = []
+    current: List[Tuple[int, dict]] = []
+    tokens = 0
+    for entry in entries:
+        cost = _estimate_tokens(entry[1]["text"][:1000])
+        if current and (len(current) >= SUMMARY_BATCH_SIZE or tokens + cost > SUMMARY_BATCH_TOKEN_BUDGET):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(entry)
+        tokens += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_response(content: str, batch: List[Tuple[int, dict]]) -> Dict[int, str]:
+    """
+    Extract per-article summaries from a batch reply.
+
+    Args:
+        content (str): Raw model output, expected to be a JSON object
+        batch (List[Tuple[int, dict]]): The (index, item) pairs that were sent
+
+    Returns:
+        Dict[int, str]: Summaries by article index; ids missing from the reply
+        or mapped to something other than a non-empty string are left out
+
+    Raises:
+        ValueError: If the reply is not JSON or has no "summaries" object
+    """
+    data = json.loads(content)
+    summaries = data.get("summaries") if isinstance(data, dict) else None
+    if not isinstance(summaries, dict):
+        raise ValueError("batch reply has no 'summaries' object")
+
+    result = {}
+    for index, _ in batch:
+        summary = summaries.get(str(index))
+        if isinstance(summary, str) and summary.strip():
+            result[index] = _clean_summary(summary.strip())
+    return result
+
+
+async def _complete_batch(batch: List[Tuple[int, dict]], lang: str, priority: int = INTERACTIVE) -> Dict[int, str]:
+    system_prompt = SYSTEM_PROMPTS.get(lang, DEFAULT_SYSTEM_PROMPT)
+    articles = [{"id": str(index), "text": item["text"][:1000]} for index, item in batch]
+    response = await llm_gateway.complete(
+        priority,
+        model=OPENAI_SUMMARY_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"{BATCH_INSTRUCTIONS}\n\n{json.dumps(articles, ensure_ascii=False)}"},
+        ],
+        temperature=0.3,
+        max_tokens=SUMMARY_MAX_TOKENS * len(batch) + 50,
+        response_format={"type": "json_object"},
+    )
+    return _parse_batch_response(response.choices[0].message.content, batch)
+
+
+async def _summarize_single(
+    index: int,
+    item: dict,
+    lang: str,
+    cache_key: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    priority: int = INTERACTIVE,
+) -> Tuple[int, str]:
+    async with semaphore:
+        try:
+            summary = await asyncio.wait_for(_complete_single(item["text"], lang, priority), timeout)
+        except asyncio.TimeoutError:
+            print(f"[WARNING] Summary timed out after {timeout}s")
+            return index, _fallback(item)
+        except LLM_UNAVAILABLE:
+            return index, _fallback(item)
+        except Exception as e:
+            print(f"[ERROR] OpenAI Error: {e}")
+            return index, SUMMARY_UNAVAILABLE
+
+    SUMMARIES.labels(LLM).inc()
+    await summary_cache.set(cache_key, summary)
+    return index, summary
+
+
+async def _summarize_group(
+    group: List[Tuple[int, dict]],
+    lang: str,
+    cache_keys: Dict[int, str],
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    priority: int = INTERACTIVE,
+) -> List[Tuple[int, str]]:
+    if len(group) == 1:
+        index, item = group[0]
+        return [await _summarize_single(index, item, lang, cache_keys[index], semaphore, timeout, priority)]
+
+    async with semaphore:
+        try:
+            done = await asyncio.wait_for(_complete_batch(group, lang, priority), SUMMARY_BATCH_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            print(f"[WARNING] Batch summary timed out after {SUMMARY_BATCH_TIMEOUT_SECONDS}s")
+            return [(index, _fallback(item)) for index, item in group]
+        except LLM_UNAVAILABLE:
+            return [(index, _fallback(item)) for index, item in group]
+        except (ValueError, TypeError) as e:
+            # json.JSONDecodeError is a ValueError
+            print(f"[WARNING] Malformed batch summary, falling back to per-article calls: {e}")
+            done = {}
+        except Exception as e:
+            print(f"[ERROR] OpenAI Error: {e}")
+            return [(index, SUMMARY_UNAVAILABLE) for index, _ in group]
+
+    SUMMARIES.labels(LLM).inc(len(done))
+    await asyncio.gather(*(summary_cache.set(cache_keys[i], s) for i, s in done.items()))
+    results = list(done.items())
+
+    missing = [(index, item) for index, item in group if index not in done]
+    if missing:
+        results.extend(await asyncio.gather(*(
+            _summarize_single(index, item, lang, cache_keys[index], semaphore, timeout, priority)
+            for index, item in missing
+        )))
+    return results
+
+
+async def summaries_cached(items: List[dict], lang: str = "en") -> bool:
+    """
+    Check whether every summary for these articles can be produced without the LLM.
+
+    Args:
+        items (List[dict]): Articles as passed to iter_summaries
+        lang (str): Target language for summaries
+
+    Returns:
+        bool: True if each article gets a canned, local (short text) or cached summary
+    """
+    keys = [
+        summary_cache_key(item["text"], lang, OPENAI_SUMMARY_MODEL, item.get("url"))
+        for item in items
+        if len(item.get("text", "")) > 30
+        and not _precheck(item["text"])
+        and not (LOCAL_SUMMARY_ENABLED and _is_short(item))
+    ]
+    cached = await asyncio.gather(*(summary_cache.get(key) for key in keys))
+    return all(summary is not None for summary in cached)
+
+
+async def iter_summaries(
+    items: List[dict],
+    lang: str = "en",
+    concurrency: int = SUMMARY_CONCURRENCY,
+    timeout: float = SUMMARY_TIMEOUT_SECONDS,
+    batching: bool = SUMMARY_BATCHING,
+    priority: int = INTERACTIVE,
+) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Summarize articles concurrently and yield each summary as soon as it is ready.
+
+    Canned, local (short text) and cached summaries are yielded first; the
+    remaining articles go to the tier choose_tier() picks, the LLM ones in
+    batches when `batching` is enabled.
+
+    Args:
+        items (List[dict]): Articles with "text" (content to summarize),
+            "description" (used as fallback) and optional "title" and "url" keys
+        lang (str): Target language for summaries (default: "en")
+        concurrency (int): Maximum number of in-flight LLM calls
+        timeout (float): Per-article timeout in seconds
+        batching (bool): Pack several articles into one LLM request
+        priority (int): LLM gateway priority (INTERACTIVE or BACKGROUND)
+
+    Yields:
+        Tuple[int, str]: (index into items, summary) in completion order
+    """
+    pending: List[Tuple[int, dict]] = []
+    for index, item in enumerate(items):
+        text = item.get("text", "")
+        # Minimum content threshold for AI processing
+        if len(text) <= 30:
+            SUMMARIES.labels("canned").inc()
+            yield index, LIMITED_CONTENT
+            continue
+        canned = _precheck(text)
+        if canned:
+            SUMMARIES.labels("canned").inc()
+            yield index, canned
+            continue
+        if LOCAL_SUMMARY_ENABLED and _is_short(item):
+            SUMMARIES.labels(LOCAL).inc()
+            yield index, _local_summary(item)
+            continue
+        pending.append((index, item))
+
+    cache_keys = {
+        index: summary_cache_key(item["text"], lang, OPENAI_SUMMARY_MODEL, item.get("url"))
+        for index, item in pending
+    }
+    cached = await asyncio.gather(*(summary_cache.get(cache_keys[index]) for index, _ in pending))
+
+    misses: List[Tuple[int, dict]] = []
+    queued_tokens = 0
+    for (index, item), summary in zip(pending, cached):
+        if summary is not None:
+            SUMMARIES.labels("cached").inc()
+            yield index, summary
+        elif choose_tier(item, queued_tokens, len(misses)) == LOCAL:
+            SUMMARIES.labels(LOCAL).inc()
+            yield index, _local_summary(item)
+        else:
+            misses.append((index, item))
+            queued_tokens += _estimate_tokens(item["text"][:1000]) + SUMMARY_MAX_TOKENS
+
+    groups = _pack_batches(misses) if batching else [[entry] for entry in misses]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [
+        asyncio.create_task(_summarize_group(group, lang, cache_keys, semaphore, timeout, priority))
+        for group in groups
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for result in await next_done:
+                yield result
+    finally:
+        # Stop outstanding work if the client went away mid-stream
+        for task in tasks:
+            task.cancel()
+
+
+async def summarize_articles(
+    items: List[dict],
+    lang: str = "en",
+    concurrency: int = SUMMARY_CONCURRENCY,
+    timeout: float = SUMMARY_TIMEOUT_SECONDS,
+    batching: bool = SUMMARY_BATCHING,
+    priority: int = INTERACTIVE,
+) -> List[str]:
+    """
+    Summarize a list of articles concurrently.
+
+    Args:
+        items (List[dict]): Articles with "text" (content to summarize),
+            "description" (used as fallback) and optional "title" and "url" keys
+        lang (str): Target language for summaries (default: "en")
+        concurrency (int): Maximum number of in-flight LLM calls
+        timeout (float): Per-article timeout in seconds
+        batching (bool): Pack several articles into one LLM request
+        priority (int): LLM gateway priority (INTERACTIVE or BACKGROUND)
+
+    Returns:
+        List[str]: One summary per input item, in the same order
+    """
+    summaries: List[str] = [""] * len(items)
+    async for index, summary in iter_summaries(items, lang, concurrency, timeout, batching, priority):
+        summaries[index] = summary
+    return summaries
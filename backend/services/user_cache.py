@@ -0,0 +1,61 @@
+# backend/services/user_cache.py
+"""
+Short-TTL cache of user documents, keyed by user ID.
+
+get_current_user reads users through this cache instead of querying Mongo on
+every authenticated request. Every route that writes to a user document must
+call invalidate_user afterwards. With several workers, another worker's
+in-process copy can lag a write by at most USER_CACHE_TTL_SECONDS.
+
+Users are loaded with SESSION_PROJECTION: the password hash is never cached;
+code that needs it reads it from Mongo.
+"""
+from typing import Optional
+
+from bson import ObjectId, json_util
+from backend.core.config import USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS
+from backend.db.mongo import db
+from backend.models.user import SESSION_PROJECTION
+from backend.utils.cache import TieredCache
+
+# json_util keeps ObjectId and datetime values intact through Redis
+user_cache = TieredCache(
+    "user",
+    maxsize=USER_CACHE_MAX_ENTRIES,
+    ttl=USER_CACHE_TTL_SECONDS,
+    dumps=json_util.dumps,
+    loads=json_util.loads,
+)
+
+
+async def get_user(user_id: str) -> Optional[dict]:
+    """
+    Load a user document by ID, using the cache when possible.
+
+    Args:
+        user_id (str): User ID as stored in the access token
+
+    Returns:
+        Optional[dict]: User document limited to SESSION_PROJECTION, None if not found
+
+    Raises:
+        bson.errors.InvalidId: If user_id is not a valid ObjectId
+    """
+    user = await user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    user = await db["users"].find_one({"_id": ObjectId(user_id)}, SESSION_PROJECTION)
+    if user is not None:
+        await user_cache.set(user_id, user)
+    return user
+
+
+async def invalidate_user(user_id) -> None:
+    """
+    Drop a user from the cache after the document was modified.
+
+    Args:
+        user_id: User ID (str or ObjectId)
+    """
+    await user_cache.delete(str(user_id))
@@ -0,0 +1,194 @@
+# backend/utils/cache.py
+"""
+Caching helpers shared across the backend.
+
+- TTLCache: in-process, size-bounded LRU cache with per-entry expiry
+- TieredCache: async cache that keeps a TTLCache in front of Redis
+  (REDIS_URL) and keeps working from the in-process tier alone when
+  Redis is not configured or not reachable
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import redis.asyncio as redis
+from backend.core.config import REDIS_URL
+
+# Seconds to wait before trying Redis again after a connection failure
+REDIS_RETRY_SECONDS = 30.0
+
+_redis_client: Optional[redis.Redis] = None
+_redis_retry_at = 0.0
+
+
+class TTLCache:
+    """
+    In-process LRU cache with a maximum size and per-entry time-to-live.
+
+    Args:
+        maxsize (int): Maximum number of entries kept before evicting the
+            least recently used one
+        ttl (float): Default time-to-live in seconds
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Return the shared Redis client, or None while Redis is unavailable.
+
+    Returns:
+        Optional[redis.Redis]: Client built from REDIS_URL, None if REDIS_URL
+        is empty or a recent connection attempt failed
+    """
+    global _redis_client
+    if not REDIS_URL or time.monotonic() < _redis_retry_at:
+        return None
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return _redis_client
+
+
+def mark_redis_down(error: Exception) -> None:
+    """Skip Redis for REDIS_RETRY_SECONDS after a failed call."""
+    global _redis_retry_at
+    if time.monotonic() >= _redis_retry_at:
+        print(f"[WARNING] Redis unavailable, using in-process cache: {error}")
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+
+class TieredCache:
+    """
+    Async two-tier cache: in-process TTLCache backed by Redis.
+
+    Reads check the local tier first and fall through to Redis; Redis hits
+    are copied into the local tier for the key's remaining Redis TTL. Values
+    must be serializable by `dumps` (JSON by default). The size bound applies
+    to the local tier; Redis relies on key TTLs and the server's maxmemory
+    policy.
+
+    Deletes and overwrites only reach Redis and the calling process, so
+    other workers keep their local copy until it expires. `local_ttl` bounds
+    that staleness for values that are invalidated or rebuilt (it applies
+    only while Redis is in use; without Redis the local tier is the cache).
+
+    Args:
+        namespace (str): Prefix for Redis keys (e.g. "summary")
+        maxsize (int): Maximum number of entries in the local tier
+        ttl (float): Default time-to-live in seconds
+        dumps (Callable[[Any], str]): Serializer for values stored in Redis
+        loads (Callable[[str], Any]): Deserializer for values read from Redis
+        local_ttl (Optional[float]): Longest time a value stays in the local
+            tier while Redis is in use (None: the value's TTL)
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        dumps: Callable[[Any], str] = json.dumps,
+        loads: Callable[[str], Any] = json.loads,
+        local_ttl: Optional[float] = None,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._dumps = dumps
+        self._loads = loads
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _local_ttl(self, ttl: float) -> float:
+        return ttl if self.local_ttl is None else min(ttl, self.local_ttl)
+
+    async def get(self, key: str) -> Any:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        client = get_redis()
+        if client is None:
+            return None
+        redis_key = self._redis_key(key)
+        try:
+            raw, remaining_ms = await client.pipeline(transaction=False).get(redis_key).pttl(redis_key).execute()
+        except Exception as e:
+            mark_redis_down(e)
+            return None
+        if raw is None:
+            return None
+
+        value = self._loads(raw)
+        # pttl is negative for keys without expiry (or gone since the get)
+        ttl = remaining_ms / 1000 if remaining_ms and remaining_ms > 0 else self.ttl
+        self.local.set(key, value, self._local_ttl(ttl))
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+
+        client = get_redis()
+        if client is None:
+            self.local.set(key, value, ttl)
+            return
+        self.local.set(key, value, self._local_ttl(ttl))
+        try:
+            await client.set(self._redis_key(key), self._dumps(value), ex=max(1, int(ttl)))
+        except Exception as e:
+            mark_redis_down(e)
+
+    async def delete(self, key: str) -> None:
+        self.local.delete(key)
+
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            await client.delete(self._redis_key(key))
+        except Exception as e:
+            mark_redis_down(e)
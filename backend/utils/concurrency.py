@@ -0,0 +1,76 @@
+# backend/utils/concurrency.py
+"""
+Asyncio helpers for coordinating concurrent work.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into a single execution.
+
+    While a call for a key is in flight, later callers with the same key
+    await the same result instead of starting their own call. Once it
+    finishes the key is released, so the next call runs again.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for key, or join the call already in flight for key.
+
+        Args:
+            key (str): Identifies calls that can share a result
+            fn (Callable[[], Awaitable[Any]]): Zero-argument coroutine factory
+
+        Returns:
+            Any: Result of the shared call (exceptions are shared too)
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        # Shield so one cancelled waiter does not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._calls
+
+
+async def gather_limited(
+    limit: int,
+    calls: Iterable[Callable[[], Awaitable[Any]]],
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Run coroutine factories concurrently with at most `limit` in flight.
+
+    Args:
+        limit (int): Maximum number of concurrent calls
+        calls (Iterable[Callable[[], Awaitable[Any]]]): Zero-argument coroutine factories
+        return_exceptions (bool): Same meaning as in asyncio.gather
+
+    Returns:
+        List[Any]: Results in the same order as `calls`
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await call()
+
+    return list(await asyncio.gather(
+        *(run(call) for call in calls),
+        return_exceptions=return_exceptions,
+    ))
@@ -0,0 +1,135 @@
+# backend/utils/dedup.py
+"""
+Near-duplicate detection for news articles.
+
+NewsData.io often returns the same wire story from several sources, and an
+OR query across topics can return it more than once. Articles are compared by
+the Jaccard similarity of the word sets of their normalized title and
+description, estimated with MinHash signatures. Locality-sensitive hashing
+(signature bands) finds candidate pairs, so the cost stays linear in the
+number of articles.
+
+Each article is compared with the first article (the representative) of
+every candidate cluster, so clusters never chain through a series of
+slightly different stories.
+"""
+import hashlib
+import random
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Sequence, Tuple, TypeVar
+
+from backend.utils.metrics import stage
+from backend.utils.topic_matcher import tokenize
+
+T = TypeVar("T")
+
+NUM_PERM = 64
+# 32 bands of 2 rows: pairs at the default threshold (0.5) almost always
+# become candidates; candidates are then checked against the threshold
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+_MASK = (1 << 64) - 1
+# Fixed seed: signatures must be comparable across calls and processes
+_rng = random.Random(0x6E657773)
+_PERMUTATIONS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)]
+
+STOPWORDS = frozenset(
+    "a an the and or but of to in on for with at by from as is are was were be been being "
+    "it its this that these those has have had will would can could says said after over "
+    "into about up out new more than not no".split()
+)
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Normalize text into the set of words used for comparison."""
+    return frozenset(w for w in tokenize(text) if w not in STOPWORDS)
+
+
+@lru_cache(maxsize=65536)
+def _permuted_hashes(word: str) -> Tuple[int, ...]:
+    # A word's value under every permutation; news vocabulary repeats a lot,
+    # so most lookups are cache hits
+    h = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+    return tuple((a * h + b) & _MASK for a, b in _PERMUTATIONS)
+
+
+def minhash(words: FrozenSet[str]) -> Tuple[int, ...]:
+    """
+    Compute the MinHash signature of a word set.
+
+    Args:
+        words (FrozenSet[str]): Normalized words (see shingles)
+
+    Returns:
+        Tuple[int, ...]: NUM_PERM minimum hash values, empty for an empty set
+    """
+    if not words:
+        return ()
+    # Column-wise minimum over the words' permuted hashes
+    return tuple(map(min, zip(*map(_permuted_hashes, words))))
+
+
+def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """Estimate the Jaccard similarity of two signatures."""
+    if not left or not right:
+        return 0.0
+    return sum(x == y for x, y in zip(left, right)) / NUM_PERM
+
+
+def cluster_near_duplicates(texts: Sequence[str], threshold: float = 0.5) -> List[List[int]]:
+    """
+    Group texts whose estimated word-set similarity reaches the threshold.
+
+    Args:
+        texts (Sequence[str]): Texts to compare
+        threshold (float): Minimum estimated Jaccard similarity (0-1)
+
+    Returns:
+        List[List[int]]: Clusters of indices into texts, in input order; the
+        first index of each cluster is its representative
+    """
+    clusters: List[List[int]] = []
+    representatives: List[Tuple[int, ...]] = []
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    for index, text in enumerate(texts):
+        signature = minhash(shingles(text))
+        bands = [(b, signature[b * ROWS:(b + 1) * ROWS]) for b in range(BANDS)] if signature else []
+
+        match = None
+        candidates = {c for band in bands for c in buckets.get(band, ())}
+        for candidate in sorted(candidates):
+            if similarity(signature, representatives[candidate]) >= threshold:
+                match = candidate
+                break
+
+        if match is None:
+            match = len(clusters)
+            clusters.append([])
+            representatives.append(signature)
+            for band in bands:
+                buckets.setdefault(band, []).append(match)
+        clusters[match].append(index)
+
+    return clusters
+
+
+def dedupe(items: Sequence[T], text: Callable[[T], str], threshold: float = 0.5) -> List[Tuple[T, List[T]]]:
+    """
+    Keep one item per cluster of near-duplicates.
+
+    Args:
+        items (Sequence[T]): Items in order of preference (the first item of
+            each cluster is kept)
+        text (Callable[[T], str]): Returns the text to compare for an item,
+            typically its title and description
+        threshold (float): Minimum estimated Jaccard similarity (0-1)
+
+    Returns:
+        List[Tuple[T, List[T]]]: (kept item, dropped duplicates) per cluster,
+        in input order
+    """
+    with stage("dedup"):
+        clusters = cluster_near_duplicates([text(item) for item in items], threshold)
+    return [(items[c[0]], [items[i] for i in c[1:]]) for c in clusters]
@@ -0,0 +1,56 @@
+# backend/utils/http_cache.py
+"""
+Conditional GET helpers.
+
+Pages get a weak ETag built from the versions of what they show (feed
+version, favorites version, preferences, template source), so a matching
+If-None-Match is answered with 304 before anything is loaded or rendered.
+JSON endpoints whose inputs have no version use a digest of the body, which
+saves the transfer but not the work.
+
+Responses are marked `private, no-cache`: browsers keep them but revalidate
+on every use, and shared caches never store them.
+"""
+import hashlib
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+from backend.core.config import ETAGS_ENABLED
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag identifying a response by everything it depends on."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def body_etag(body: bytes) -> str:
+    """Weak ETag of a response body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Whether If-None-Match lists the ETag (weak comparison, as RFC 9110 requires)."""
+    header = request.headers.get("if-none-match")
+    if not ETAGS_ENABLED or not etag or not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matching If-None-Match."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: Optional[str]) -> Response:
+    """Attach the validator headers to a full response."""
+    if ETAGS_ENABLED and etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
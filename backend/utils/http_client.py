@@ -0,0 +1,109 @@
+# backend/utils/http_client.py
+"""
+Application-wide pooled HTTP client.
+
+All outbound HTTP (NewsData.io, OpenAI) goes through one httpx.AsyncClient so
+connections and TLS sessions are reused across requests instead of being set
+up per call. The client is opened and closed by the FastAPI lifespan handler
+in main.py; code running outside the app (scripts, the ingestion worker before
+startup) gets one created on first use.
+"""
+from typing import Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+from backend.core.config import (
+    HTTP2_ENABLED,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT_SECONDS,
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+    OPENAI_TIMEOUT_SECONDS,
+)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    # HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("[WARNING] HTTP2_ENABLED is set but h2 is not installed - using HTTP/1.1")
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build a client with the configured pool limits, keep-alive and timeouts."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        http2=HTTP2_ENABLED and _http2_available(),
+    )
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called from the lifespan handler)."""
+    return get_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it if the app has not opened one.
+
+    Also usable as a FastAPI dependency: `client = Depends(get_http_client)`.
+
+    Returns:
+        httpx.AsyncClient: Shared pooled client
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+_openai: Optional[Tuple[httpx.AsyncClient, AsyncOpenAI]] = None
+
+
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """
+    Return the async OpenAI client, bound to the shared connection pool.
+
+    The OpenAI client is rebuilt if the shared HTTP client was replaced (for
+    example after the app was restarted in the same process). Its built-in
+    retries are off: services/llm_gateway.py retries in priority order.
+
+    Returns:
+        Optional[AsyncOpenAI]: Client, or None if OPENAI_API_KEY is not set
+    """
+    global _openai
+    if not OPENAI_API_KEY:
+        return None
+    http_client = get_http_client()
+    if _openai is None or _openai[0] is not http_client:
+        # The pool's default read timeout is sized for NewsData.io, not completions
+        client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=OPENAI_BASE_URL,
+            http_client=http_client,
+            max_retries=0,
+            timeout=httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        )
+        _openai = (http_client, client)
+    return _openai[1]
@@ -0,0 +1,222 @@
+# backend/utils/metrics.py
+"""
+Per-request stage timing, Prometheus metrics and the Server-Timing header.
+
+Code that waits on a dependency or does notable CPU work runs inside
+`with stage(name):`. Time spent in a stage during a request is summed per
+(stage, status) and, when the request finishes, observed in the
+newsapp_stage_duration_seconds histogram labelled by route template, stage
+and upstream status. Work outside a request (the ingestion worker) is
+observed per call with route="background".
+
+Stages:
+- mongo: every MongoDB command (command monitoring on the Motor client)
+- news_api: NewsData.io calls (status: HTTP status or exception name)
+- llm: OpenAI calls, excluding the rate-limit queue (same status values)
+- dedup, ranking: near-duplicate clustering and scoring of feed candidates
+- extractive: local TextRank summaries (services/extractive.py)
+- template: Jinja rendering (also per template in
+  newsapp_template_render_seconds)
+
+MetricsMiddleware also observes the request duration and adds a
+Server-Timing header listing the stages finished before the response
+started. For the streamed dashboard that is everything up to the headlines;
+summaries generated while streaming only show up in the histograms.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+from jinja2 import Template
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from pymongo import monitoring
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Upstream calls range from milliseconds (Mongo) to tens of seconds (LLM)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_SECONDS = Histogram(
+    "newsapp_request_duration_seconds",
+    "Time to complete an HTTP request, including streamed bodies",
+    ["route", "method", "status"],
+    buckets=BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "newsapp_stage_duration_seconds",
+    "Time spent in a stage per request (per call outside requests)",
+    ["route", "stage", "status"],
+    buckets=BUCKETS,
+)
+TEMPLATE_SECONDS = Histogram(
+    "newsapp_template_render_seconds",
+    "Time to render a template",
+    ["template"],
+    buckets=BUCKETS,
+)
+FRAGMENT_CACHE_REQUESTS = Counter(
+    "newsapp_fragment_cache_requests_total",
+    "Template fragment cache lookups",
+    ["fragment", "result"],
+)
+SUMMARIES = Counter(
+    "newsapp_summaries_total",
+    "Summaries produced, by source (canned, cached, local, llm, fallback)",
+    ["source"],
+)
+UPSTREAM_CIRCUIT_OPEN = Gauge(
+    "newsapp_upstream_circuit_open",
+    "1 while an upstream's circuit breaker is not closed",
+    ["upstream"],
+)
+UPSTREAM_TIMEOUT_SECONDS = Gauge(
+    "newsapp_upstream_timeout_seconds",
+    "Current adaptive timeout of an upstream",
+    ["upstream"],
+)
+
+
+class RequestTimings:
+    """Stage totals of one request."""
+
+    def __init__(self):
+        self.totals: Dict[Tuple[str, str], float] = {}
+        # Mongo events are reported from Motor's executor threads
+        self._lock = threading.Lock()
+
+    def add(self, name: str, status: str, seconds: float) -> None:
+        with self._lock:
+            self.totals[(name, status)] = self.totals.get((name, status), 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """Format the totals (all statuses of a stage together) as a Server-Timing value."""
+        with self._lock:
+            stages: Dict[str, float] = {}
+            for (name, _), seconds in self.totals.items():
+                stages[name] = stages.get(name, 0.0) + seconds
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in sorted(stages.items())]
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record(name: str, status: str, seconds: float) -> None:
+    """Add time spent in a stage to the current request (or observe it directly outside one)."""
+    timings = _current.get()
+    if timings is None:
+        STAGE_SECONDS.labels("background", name, status).observe(seconds)
+    else:
+        timings.add(name, status, seconds)
+
+
+class StageTimer:
+    """Handle yielded by stage(); set `status` to the upstream result."""
+
+    def __init__(self, status: str):
+        self.status = status
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageTimer]:
+    """
+    Time a block as a stage of the current request.
+
+    The status is "ok" unless the block sets timer.status; if the block
+    raises and left it at "ok", the exception's HTTP status_code (OpenAI
+    errors) or else its class name is used.
+
+    Args:
+        name (str): Stage name (see module docstring)
+    """
+    timer = StageTimer("ok")
+    start = time.perf_counter()
+    try:
+        yield timer
+    except BaseException as e:
+        if timer.status == "ok":
+            timer.status = str(getattr(e, "status_code", None) or type(e).__name__)
+        raise
+    finally:
+        record(name, timer.status, time.perf_counter() - start)
+
+
+class MongoTimingListener(monitoring.CommandListener):
+    """Records every MongoDB command as a "mongo" stage."""
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        record("mongo", "ok", event.duration_micros / 1e6)
+
+    def failed(self, event) -> None:
+        record("mongo", "error", event.duration_micros / 1e6)
+
+
+class TimedTemplate(Template):
+    """Jinja template class whose render() is recorded as a "template" stage."""
+
+    def render(self, *args, **kwargs) -> str:
+        start = time.perf_counter()
+        with stage("template"):
+            html = super().render(*args, **kwargs)
+        TEMPLATE_SECONDS.labels(self.name or "<string>").observe(time.perf_counter() - start)
+        return html
+
+
+def _route_label(scope) -> str:
+    # Route templates, not raw paths, keep label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing request and stage durations.
+
+    Args:
+        app: Wrapped ASGI application
+        server_timing (bool): Add the Server-Timing response header
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = _route_label(scope)
+            REQUEST_SECONDS.labels(route, scope["method"], str(status)).observe(time.perf_counter() - start)
+            for (name, stage_status), seconds in list(timings.totals.items()):
+                STAGE_SECONDS.labels(route, name, stage_status).observe(seconds)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,35 @@
+# backend/utils/pagination.py
+"""
+Opaque pagination cursors.
+
+A cursor is a small dict (e.g. {"o": 20} for an offset into a feed, or
+{"p": "<NewsData.io nextPage token>", "s": 3}, or a favorite's saved_at and
+_id) serialized as unpadded
+URL-safe base64 JSON, so clients pass it back unchanged and never build
+one themselves.
+"""
+import base64
+import json
+
+
+def encode_cursor(position: dict) -> str:
+    """Return the opaque cursor for a position."""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Parse a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(position, dict):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return position
@@ -0,0 +1,281 @@
+# backend/utils/resilience.py
+"""
+Per-upstream resilience: circuit breaker, adaptive timeout and hedging.
+
+Every call to an upstream (NewsData.io, OpenAI) goes through its Upstream:
+
+- Timeout: UPSTREAM_TIMEOUT_P95_MULTIPLIER x the p95 latency of recent calls,
+  clamped to the upstream's [min, max] range (max until enough calls were
+  seen), so a slow upstream no longer holds every request for the full
+  client timeout.
+- Circuit breaker: over the last UPSTREAM_BREAKER_WINDOW calls, if the
+  share of failures or of calls slower than the upstream's slow threshold
+  reaches its limit, the breaker opens and calls fail at once with
+  CircuitOpenError for UPSTREAM_BREAKER_OPEN_SECONDS. A single probe call is
+  then let through: success closes the breaker, failure reopens it.
+  A call the caller cancels after the slow threshold (e.g. on its own,
+  shorter deadline) counts as a slow failure and as a latency sample, so
+  caller deadlines do not hide a hanging upstream.
+- Hedging (optional, idempotent calls only): if a call has not answered
+  after the observed p95, a second identical call is started and the first
+  answer wins.
+
+Callers fall back to cached data on UpstreamUnavailable (see
+external/news_api.py and services/summarizer.py).
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+
+from backend.core.config import (
+    UPSTREAM_BREAKER_ERROR_RATE,
+    UPSTREAM_BREAKER_MIN_CALLS,
+    UPSTREAM_BREAKER_OPEN_SECONDS,
+    UPSTREAM_BREAKER_SLOW_RATE,
+    UPSTREAM_BREAKER_WINDOW,
+    UPSTREAM_TIMEOUT_P95_MULTIPLIER,
+)
+from backend.utils.metrics import UPSTREAM_CIRCUIT_OPEN, UPSTREAM_TIMEOUT_SECONDS
+
+T = TypeVar("T")
+
+# Latency samples kept for the p95
+LATENCY_SAMPLES = 200
+# Calls seen before the timeout adapts (until then: max_timeout)
+MIN_LATENCY_SAMPLES = 20
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class UpstreamUnavailable(Exception):
+    """Base class for calls refused or cut off by the resilience layer."""
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    """The upstream's breaker is open; the call was not attempted."""
+
+
+class UpstreamTimeoutError(UpstreamUnavailable):
+    """The call exceeded the upstream's adaptive timeout."""
+
+
+class LatencyTracker:
+    """Rolling window of call latencies with a cached p95."""
+
+    def __init__(self, size: int = LATENCY_SAMPLES):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._p95: Optional[float] = None
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._p95 = None
+
+    def p95(self) -> Optional[float]:
+        """p95 of the window, None until MIN_LATENCY_SAMPLES calls were seen."""
+        if len(self._samples) < MIN_LATENCY_SAMPLES:
+            return None
+        if self._p95 is None:
+            ordered = sorted(self._samples)
+            self._p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        return self._p95
+
+
+class CircuitBreaker:
+    """
+    Breaker over the outcomes of the last `window` calls.
+
+    Args:
+        window (int): Number of recent calls considered
+        min_calls (int): Calls needed in the window before it can open
+        error_rate (float): Failure share that opens it (0-1)
+        slow_rate (float): Share of slow calls that opens it (0-1)
+        open_seconds (float): Time it stays open before a probe call
+    """
+
+    def __init__(self, window: int, min_calls: int, error_rate: float, slow_rate: float, open_seconds: float):
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+
+    def refusing(self) -> bool:
+        """Whether a call would be refused now (without claiming the probe)."""
+        if self.state == OPEN:
+            return time.monotonic() - self._opened_at < self.open_seconds
+        return self.state == HALF_OPEN and self._probing
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now (claims the probe when half-open)."""
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record(self, ok: bool, slow: bool) -> None:
+        """Record a call outcome and update the state."""
+        if self.state == HALF_OPEN and self._probing:
+            self._probing = False
+            if ok and not slow:
+                self.state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+
+        self._outcomes.append((ok, slow))
+        calls = len(self._outcomes)
+        if self.state != CLOSED or calls < self.min_calls:
+            return
+        failures = sum(not o for o, _ in self._outcomes)
+        slow_calls = sum(s for _, s in self._outcomes)
+        if failures / calls >= self.error_rate or slow_calls / calls >= self.slow_rate:
+            self._open()
+
+    def release(self) -> None:
+        """Give the probe back when it ended without telling anything about the upstream."""
+        self._probing = False
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+class Upstream:
+    """
+    Resilience policy for one upstream service.
+
+    Args:
+        name (str): Label used in logs and metrics
+        min_timeout (float): Lower bound of the adaptive timeout (seconds)
+        max_timeout (float): Upper bound, used until enough calls were seen
+        slow_call_seconds (float): Calls slower than this count as slow for the breaker
+        is_failure (Callable[[BaseException], bool]): Which exceptions count
+            against the upstream (e.g. not 4xx caused by our own request)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_timeout: float,
+        max_timeout: float,
+        slow_call_seconds: float,
+        is_failure: Callable[[BaseException], bool] = lambda e: True,
+    ):
+        self.name = name
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.is_failure = is_failure
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(
+            UPSTREAM_BREAKER_WINDOW,
+            UPSTREAM_BREAKER_MIN_CALLS,
+            UPSTREAM_BREAKER_ERROR_RATE,
+            UPSTREAM_BREAKER_SLOW_RATE,
+            UPSTREAM_BREAKER_OPEN_SECONDS,
+        )
+
+    @property
+    def is_open(self) -> bool:
+        """True unless the breaker is closed (open, or half-open waiting for a probe)."""
+        return self.breaker.state != CLOSED
+
+    def timeout(self) -> float:
+        """Current adaptive timeout in seconds."""
+        p95 = self.latency.p95()
+        if p95 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p95 * UPSTREAM_TIMEOUT_P95_MULTIPLIER))
+
+    def check(self) -> None:
+        """
+        Raise CircuitOpenError if a call may not be attempted now.
+
+        Use before queueing work for the upstream; call() checks again.
+        """
+        if self.breaker.refusing():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def _record(self, ok: bool, seconds: float) -> None:
+        was_open = self.is_open
+        self.breaker.record(ok, seconds >= self.slow_call_seconds)
+        if self.is_open != was_open:
+            print(f"[WARNING] {self.name} circuit {'opened' if self.is_open else 'closed'}")
+        UPSTREAM_CIRCUIT_OPEN.labels(self.name).set(1 if self.is_open else 0)
+        UPSTREAM_TIMEOUT_SECONDS.labels(self.name).set(self.timeout())
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> T:
+        delay = self.latency.p95()
+        tasks = {asyncio.ensure_future(fn())}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    tasks.add(asyncio.ensure_future(fn()))
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def call(self, fn: Callable[[], Awaitable[T]], hedge: bool = False) -> T:
+        """
+        Run one upstream call under the breaker and the adaptive timeout.
+
+        Args:
+            fn (Callable[[], Awaitable[T]]): Starts the call; invoked twice when hedging
+            hedge (bool): Hedge the call (idempotent requests only)
+
+        Returns:
+            T: The call's result
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            UpstreamTimeoutError: If the call exceeded the adaptive timeout
+            Exception: Whatever the call raised
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        timeout = self.timeout()
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(self._hedged(fn) if hedge else fn(), timeout)
+        except asyncio.TimeoutError:
+            self.latency.add(timeout)
+            self._record(False, timeout)
+            raise UpstreamTimeoutError(f"{self.name} did not answer within {timeout:.1f}s") from None
+        except asyncio.CancelledError:
+            elapsed = time.monotonic() - start
+            if elapsed >= self.slow_call_seconds:
+                # Cut off by the caller's deadline: the upstream was too slow
+                self.latency.add(elapsed)
+                self._record(False, elapsed)
+            elif self.breaker.state == HALF_OPEN:
+                # The caller gave up early; nothing is known about the upstream
+                self.breaker.release()
+            raise
+        except Exception as e:
+            self._record(not self.is_failure(e), time.monotonic() - start)
+            raise
+
+        elapsed = time.monotonic() - start
+        self.latency.add(elapsed)
+        self._record(True, elapsed)
+        return result
@@ -0,0 +1,108 @@
+# backend/utils/templating.py
+"""
+Shared Jinja template environment.
+
+All routers render through the one `templates` instance defined here, so
+each template is compiled and cached once per worker. Compiled bytecode is
+also written to disk (TEMPLATE_BYTECODE_CACHE), so a restarted worker loads
+templates without compiling them again; entries are keyed by the template
+source checksum, so edited templates are recompiled.
+
+Parts of a page that do not depend on who is viewing it can be cached as
+rendered HTML with the {% cache %} tag:
+
+    {% cache "article-card", item.url, item.summary, item.alternates %}
+      ...
+    {% endcache %}
+
+The first argument names the fragment, the others are everything the
+fragment depends on; the key is a digest of all of them. Fragments live in
+an in-process LRU cache for FRAGMENT_CACHE_TTL_SECONDS.
+"""
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, nodes
+from jinja2.ext import Extension
+from starlette.templating import Jinja2Templates
+from backend.core.config import (
+    FRAGMENT_CACHE_ENABLED,
+    FRAGMENT_CACHE_MAX_ENTRIES,
+    FRAGMENT_CACHE_TTL_SECONDS,
+    TEMPLATE_AUTO_RELOAD,
+    TEMPLATE_BYTECODE_CACHE,
+    TEMPLATE_CACHE_DIR,
+)
+from backend.utils.cache import TTLCache
+from backend.utils.metrics import FRAGMENT_CACHE_REQUESTS, TimedTemplate
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+fragment_cache = TTLCache(maxsize=FRAGMENT_CACHE_MAX_ENTRIES, ttl=FRAGMENT_CACHE_TTL_SECONDS)
+
+
+def fragment_key(parts: List) -> str:
+    """Cache key for a fragment: its name plus a digest of what it depends on."""
+    digest = hashlib.blake2b(repr(parts[1:]).encode("utf-8"), digest_size=16).hexdigest()
+    return f"{parts[0]}:{digest}"
+
+
+class FragmentCacheExtension(Extension):
+    """Adds the {% cache name, *depends_on %}...{% endcache %} tag."""
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method("_render_cached", [nodes.List(parts)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, parts: List, caller: Callable[[], str]) -> str:
+        if not FRAGMENT_CACHE_ENABLED:
+            return caller()
+        key = fragment_key(parts)
+        html = fragment_cache.get(key)
+        if html is None:
+            FRAGMENT_CACHE_REQUESTS.labels(parts[0], "miss").inc()
+            html = caller()
+            fragment_cache.set(key, html)
+        else:
+            FRAGMENT_CACHE_REQUESTS.labels(parts[0], "hit").inc()
+        return html
+
+
+def create_environment() -> Environment:
+    """Build the Jinja environment used by every router."""
+    bytecode_cache = None
+    if TEMPLATE_BYTECODE_CACHE:
+        if TEMPLATE_CACHE_DIR:
+            Path(TEMPLATE_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+        # None: Jinja's per-user directory under the system temp dir
+        bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR or None)
+
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        auto_reload=TEMPLATE_AUTO_RELOAD,
+        bytecode_cache=bytecode_cache,
+        extensions=[FragmentCacheExtension],
+    )
+    # Render time per template goes to the metrics
+    env.template_class = TimedTemplate
+    return env
+
+
+templates = Jinja2Templates(env=create_environment())
+
+
+@lru_cache(maxsize=None)
+def template_version(name: str) -> str:
+    """Digest of a template's source, so ETags change when the page markup does."""
+    source, _, _ = templates.env.loader.get_source(templates.env, name)
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
@@ -0,0 +1,112 @@
+# backend/utils/topic_matcher.py
+"""
+Precompiled multi-topic matcher for article filtering.
+
+Topics are compiled once per topic set (see get_matcher) into a lookup table
+of words plus an index of multi-word phrases by their first word. Matching
+tokenizes the article once and does set lookups, so the cost depends on the
+article length and not on how many topics are being matched.
+"""
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+# ASCII punctuation plus the typographic quotes and dashes common in news copy
+_PUNCTUATION = string.punctuation + "‘’“”–—…«»"
+_SEPARATORS = str.maketrans({c: " " for c in _PUNCTUATION})
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased words, treating punctuation as a separator."""
+    return text.lower().translate(_SEPARATORS).split()
+
+
+class TopicMatcher:
+    """
+    Match a fixed set of topics against text in a single pass.
+
+    Topics match as whole words, case-insensitively; a multi-word topic
+    matches the same words in sequence regardless of punctuation or spacing
+    between them ("climate change" matches "Climate-change").
+
+    Args:
+        topics (Iterable[str]): Topics to match; blanks and duplicates are ignored
+    """
+
+    def __init__(self, topics: Iterable[str]):
+        self._words: Dict[str, str] = {}
+        self._phrases: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        self.topics: List[str] = []
+
+        seen = set()
+        for topic in topics:
+            tokens = tuple(tokenize(topic))
+            if not tokens or tokens in seen:
+                continue
+            seen.add(tokens)
+            canonical = topic.strip()
+            self.topics.append(canonical)
+            if len(tokens) == 1:
+                self._words[tokens[0]] = canonical
+            else:
+                self._phrases.setdefault(tokens[0], []).append((tokens, canonical))
+
+        self._word_set = frozenset(self._words)
+        self._phrase_heads = frozenset(self._phrases)
+
+    def _find_phrases(self, tokens: List[str], heads: Set[str], first_only: bool) -> Set[str]:
+        found = set()
+        for i, token in enumerate(tokens):
+            if token not in heads:
+                continue
+            for phrase, canonical in self._phrases[token]:
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    found.add(canonical)
+                    if first_only:
+                        return found
+        return found
+
+    def matches(self, text: str) -> bool:
+        """Return True if any topic occurs in text."""
+        tokens = tokenize(text)
+        token_set = set(tokens)
+        if not token_set.isdisjoint(self._word_set):
+            return True
+        heads = token_set.intersection(self._phrase_heads)
+        return bool(heads) and bool(self._find_phrases(tokens, heads, first_only=True))
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Return the topics that occur in text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            Set[str]: Matched topics, spelled as they were given to the matcher
+        """
+        tokens = tokenize(text)
+        token_set = set(tokens)
+        found = {self._words[w] for w in token_set.intersection(self._word_set)}
+        heads = token_set.intersection(self._phrase_heads)
+        if heads:
+            found |= self._find_phrases(tokens, heads, first_only=False)
+        return found
+
+
+@lru_cache(maxsize=512)
+def _cached_matcher(topics: tuple) -> TopicMatcher:
+    return TopicMatcher(topics)
+
+
+def get_matcher(topics: Iterable[str]) -> TopicMatcher:
+    """
+    Return a compiled matcher for a topic set, reusing one built earlier.
+
+    Args:
+        topics (Iterable[str]): Topics to match (order does not matter)
+
+    Returns:
+        TopicMatcher: Shared matcher for this topic set
+    """
+    return _cached_matcher(tuple(sorted({t.strip() for t in topics if t and t.strip()})))
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Load and latency benchmark: the app against local upstream stubs.
+
+Starts three processes and drives HTTP load at them:
+
+- stub upstreams: a NewsData.io look-alike (/api/1/news) and an OpenAI chat
+  completions look-alike (/v1/chat/completions), with configurable latency,
+  jitter and error rate, serving deterministic articles and summaries;
+- the app (uvicorn backend.main:app), pointed at the stubs through
+  NEWS_API_URL / OPENAI_BASE_URL and at a local MongoDB, or at an in-memory
+  mongomock database with --mongo-uri mock (needs `pip install mongomock-motor`);
+- this script, which registers benchmark users, sets their topics and saves
+  some favorites, then requests each route at each concurrency level.
+
+Results (throughput and p50/p95/p99 latency per route and concurrency level)
+are printed as JSON, so runs before and after a change can be diffed.
+
+Usage:
+    python benchmarks/bench_load.py --concurrency 1 8 32 --duration 10
+    python benchmarks/bench_load.py --routes dashboard news --llm-latency-ms 800 \\
+        --llm-error-rate 0.05 --output before.json
+    python benchmarks/bench_load.py --mongo-uri mongodb://localhost:27017 --ingest
+
+/login posts the development test user's email (the only account login looks
+up, see routers/auth.py). Its stored hash does not match the password in the
+comment next to it, so by default every login is rejected after the bcrypt
+check: the measured cost is bcrypt verification plus rendering login.html.
+Pass --login-password to measure successful logins (302) instead.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Result pages (nextPage tokens) the NewsData.io stub serves per query
+STUB_NEWS_PAGES = 5
+ROUTES = ["dashboard", "news", "ai-summarized", "favorites", "login"]
+TOPICS = ["Football", "Space", "Climate", "Music", "Security", "Food", "Finance", "Health"]
+WORDS = (
+    "report officials announced study shows market update city government "
+    "company launch record growth plan team season fans data research "
+    "scientists players budget prices network release festival policy deal"
+).split()
+SOURCES = ["wire", "dailynews", "globaltimes", "metropost", "techwatch", "sportsdesk"]
+
+# Development test user looked up by POST /login (see routers/auth.py)
+LOGIN_EMAIL = "asafasaf16@gmail.com"
+
+
+# --- Upstream stubs ---------------------------------------------------------
+
+def make_results(query: str, size: int, seed: int, page: int = 0) -> List[dict]:
+    """Deterministic NewsData.io results for a query page; every third story is syndicated twice."""
+    topics = [t.strip() for t in query.split(" OR ") if t.strip()] or ["news"]
+    rng = random.Random(f"{seed}|{query}|{size}|{page}")
+    now = datetime.now(timezone.utc)
+    results = []
+    while len(results) < size:
+        n = len(results)
+        topic = topics[n % len(topics)]
+        title = f"{topic.capitalize()} {' '.join(rng.choice(WORDS) for _ in range(7))}"
+        # Several sentences and over LOCAL_SUMMARY_MAX_WORDS, so the summarizer
+        # picks the LLM tier (short descriptions would be summarized locally)
+        description = " ".join(
+            " ".join(rng.choice(WORDS) for _ in range(20)).capitalize() + "." for _ in range(3)
+        ) + f" More reporting about {topic}."
+        article = {
+            "title": title,
+            "link": f"https://stub.news/{topic}/{rng.getrandbits(32):08x}",
+            "description": description,
+            "content": " ".join(rng.choice(WORDS) for _ in range(150)),
+            "pubDate": (now - timedelta(minutes=rng.randint(0, 48 * 60))).strftime("%Y-%m-%d %H:%M:%S"),
+            "source_id": rng.choice(SOURCES),
+            "language": "english",
+        }
+        results.append(article)
+        if n % 3 == 0 and len(results) < size:
+            # Same story from another source: exercises near-duplicate clustering
+            results.append({
+                **article,
+                "link": f"https://stub.news/{topic}/{rng.getrandbits(32):08x}",
+                "description": description.replace(" about ", " reported about "),
+                "source_id": rng.choice(SOURCES),
+            })
+    return results
+
+
+def _completion(content: str, model: str, prompt_chars: int) -> dict:
+    prompt_tokens = prompt_chars // 4
+    completion_tokens = len(content) // 4
+    return {
+        "id": f"chatcmpl-stub{random.getrandbits(32):08x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def build_stub_app(args):
+    """Starlette app serving both upstream stubs."""
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    rng = random.Random(args.seed)
+    stats = {"news": 0, "news_errors": 0, "llm": 0, "llm_errors": 0}
+
+    async def delay(latency_ms: float, jitter_ms: float) -> None:
+        await asyncio.sleep(max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000)
+
+    async def news(request):
+        stats["news"] += 1
+        await delay(args.news_latency_ms, args.news_jitter_ms)
+        if rng.random() < args.news_error_rate:
+            stats["news_errors"] += 1
+            return JSONResponse({"status": "error"}, status_code=args.news_error_status)
+        size = int(request.query_params.get("size", 10))
+        # nextPage tokens "p1", "p2", ... up to STUB_NEWS_PAGES pages
+        page = int(request.query_params.get("page", "p0")[1:] or 0)
+        results = make_results(request.query_params.get("q", ""), size, args.seed, page)
+        payload = {"status": "success", "totalResults": size * STUB_NEWS_PAGES, "results": results}
+        if page + 1 < STUB_NEWS_PAGES:
+            payload["nextPage"] = f"p{page + 1}"
+        return JSONResponse(payload)
+
+    async def chat(request):
+        stats["llm"] += 1
+        body = await request.json()
+        await delay(args.llm_latency_ms, args.llm_jitter_ms)
+        if rng.random() < args.llm_error_rate:
+            stats["llm_errors"] += 1
+            return JSONResponse(
+                {"error": {"message": "stub error", "type": "stub"}},
+                status_code=args.llm_error_status,
+                headers={"retry-after-ms": "200"},
+            )
+        messages = body.get("messages", [])
+        prompt = messages[-1]["content"] if messages else ""
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+        summary = "Stub summary: " + " ".join(prompt.split()[:30])
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            # Batch request: the articles are the JSON array after the instructions
+            articles = json.loads(prompt[prompt.index("["):])
+            summary = json.dumps({"summaries": {
+                a["id"]: "Stub summary: " + " ".join(a["text"].split()[:30]) for a in articles
+            }})
+        return JSONResponse(_completion(summary, body.get("model", "stub"), prompt_chars))
+
+    async def stub_stats(request):
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/api/1/news", news),
+        Route("/v1/chat/completions", chat, methods=["POST"]),
+        Route("/stats", stub_stats),
+    ])
+
+
+def serve_stubs(args) -> None:
+    import uvicorn
+    uvicorn.run(build_stub_app(args), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def serve_app(args) -> None:
+    if args.mock_mongo:
+        try:
+            import mongomock_motor
+        except ImportError:
+            sys.exit("--mongo-uri mock needs mongomock-motor: pip install mongomock-motor")
+        import motor.motor_asyncio
+        # Must happen before backend.db.mongo creates its client
+        motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+
+    import uvicorn
+    from backend.main import app
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+# --- Orchestration ----------------------------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start(argv: List[str], env: Optional[dict], verbose: bool) -> subprocess.Popen:
+    output = None if verbose else subprocess.DEVNULL
+    return subprocess.Popen([sys.executable, __file__, *argv], env=env, cwd=ROOT, stdout=output, stderr=output)
+
+
+async def wait_ready(client: httpx.AsyncClient, url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url}: process exited with code {process.returncode} (rerun with --verbose)")
+        try:
+            await client.get(url)
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def app_env(args, stub_url: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "NEWS_API_URL": f"{stub_url}/api/1/news",
+        "NEWS_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "OPENAI_API_KEY": "bench",
+        "MONGODB_URI": "mongodb://mock" if args.mongo_uri == "mock" else args.mongo_uri,
+        "DATABASE_NAME": args.database,
+        "REDIS_URL": args.redis_url,
+        "INGEST_ENABLED": "true" if args.ingest else "false",
+        "PYTHONUNBUFFERED": "1",
+    })
+    return env
+
+
+async def seed_users(client: httpx.AsyncClient, args) -> List[Tuple[str, List[str]]]:
+    """Register benchmark users, set their topics and save favorites; return (token, topics) per user."""
+    rng = random.Random(args.seed)
+    run_id = f"{int(time.time())}{rng.getrandbits(16):04x}"
+    tokens = []
+    for i in range(args.users):
+        response = await client.post("/register", data={
+            "full_name": f"Bench User {i}",
+            "email": f"bench-{run_id}-{i}@example.com",
+            "password": "bench-password",
+        })
+        token = response.cookies.get("access_token")
+        if not token:
+            raise RuntimeError(f"registration failed: HTTP {response.status_code}")
+        # Requests pick their user explicitly; keep the client's cookie jar empty
+        client.cookies.clear()
+        headers = auth_headers(token)
+        topics = rng.sample(TOPICS, args.topics_per_user)
+        await client.post(
+            "/profile",
+            data={"topics": topics, "article_count": str(args.article_count)},
+            headers=headers,
+        )
+        for article in make_results(" OR ".join(t.lower() for t in topics), args.favorites_per_user, args.seed):
+            await client.post("/favorites/add", data={
+                "url": article["link"],
+                "title": article["title"],
+                "source": article["source_id"],
+                "published": article["pubDate"],
+            }, headers=headers)
+        tokens.append((token, topics))
+    return tokens
+
+
+def auth_headers(token: str) -> dict:
+    return {"Cookie": f"access_token={token}"}
+
+
+def make_request(route: str, users: list, rng: random.Random, args):
+    """Return (method, url, kwargs) for one request to a route."""
+    if route == "login":
+        return "POST", "/login", {"data": {"email": LOGIN_EMAIL, "password": args.login_password}}
+    token, topics = rng.choice(users)
+    kwargs = {"headers": auth_headers(token)}
+    if route == "dashboard":
+        return "GET", "/dashboard", kwargs
+    if route == "favorites":
+        return "GET", "/favorites/", kwargs
+    kwargs["params"] = [("topics", t) for t in topics]
+    if route == "news":
+        kwargs["params"].append(("page_size", str(args.article_count)))
+        return "GET", "/news/", kwargs
+    return "GET", "/news/ai-summarized", kwargs
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], statuses: Dict[str, int], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    ms = lambda v: round(v * 1000, 2)  # noqa: E731
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+            "p50": ms(percentile(ordered, 50)),
+            "p95": ms(percentile(ordered, 95)),
+            "p99": ms(percentile(ordered, 99)),
+            "max": ms(ordered[-1]) if ordered else 0.0,
+        },
+    }
+
+
+async def run_level(client: httpx.AsyncClient, route: str, concurrency: int, users: list, args) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    deadline = time.monotonic() + args.duration
+    budget = [args.requests] if args.requests else None
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        rng = random.Random(f"{args.seed}|{route}|{worker_id}")
+        while time.monotonic() < deadline:
+            if budget is not None:
+                if budget[0] <= 0:
+                    return
+                budget[0] -= 1
+            method, url, kwargs = make_request(route, users, rng, args)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                # Streamed dashboards count until the last summary arrives
+                await response.aread()
+                status = str(response.status_code)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return summarize(latencies, statuses, errors, time.perf_counter() - started)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def benchmark(args) -> dict:
+    stub_port, app_port = free_port(), free_port()
+    stub_url, app_url = f"http://127.0.0.1:{stub_port}", f"http://127.0.0.1:{app_port}"
+    stub_argv = [
+        "stubs", "--port", str(stub_port), "--seed", str(args.seed),
+        "--news-latency-ms", str(args.news_latency_ms), "--news-jitter-ms", str(args.news_jitter_ms),
+        "--news-error-rate", str(args.news_error_rate), "--news-error-status", str(args.news_error_status),
+        "--llm-latency-ms", str(args.llm_latency_ms), "--llm-jitter-ms", str(args.llm_jitter_ms),
+        "--llm-error-rate", str(args.llm_error_rate), "--llm-error-status", str(args.llm_error_status),
+    ]
+    app_argv = ["app", "--port", str(app_port)] + (["--mock-mongo"] if args.mongo_uri == "mock" else [])
+
+    processes = [start(stub_argv, None, args.verbose)]
+    try:
+        processes.append(start(app_argv, app_env(args, stub_url), args.verbose))
+        limits = httpx.Limits(max_connections=max(args.concurrency) + 10, max_keepalive_connections=max(args.concurrency))
+        async with httpx.AsyncClient(base_url=app_url, timeout=args.timeout, limits=limits) as client:
+            await wait_ready(client, f"{stub_url}/stats", processes[0])
+            await wait_ready(client, f"{app_url}/login", processes[1])
+            users = await seed_users(client, args)
+            if args.ingest:
+                # Give the first ingestion cycle time to fill the article store
+                await asyncio.sleep(args.ingest_wait)
+
+            results = {}
+            for route in args.routes:
+                # Warm caches and connection pools so levels are comparable
+                for _ in range(args.warmup):
+                    method, url, kwargs = make_request(route, users, random.Random(args.seed), args)
+                    await (await client.request(method, url, **kwargs)).aread()
+                results[route] = {
+                    str(level): await run_level(client, route, level, users, args)
+                    for level in args.concurrency
+                }
+            upstream = (await client.get(f"{stub_url}/stats")).json()
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    return {
+        "revision": git_revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("command", "output", "verbose")
+        },
+        "upstream_calls": upstream,
+        "results": results,
+    }
+
+
+def add_upstream_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("upstream stubs")
+    group.add_argument("--seed", type=int, default=42)
+    group.add_argument("--news-latency-ms", type=float, default=150)
+    group.add_argument("--news-jitter-ms", type=float, default=50)
+    group.add_argument("--news-error-rate", type=float, default=0.0)
+    group.add_argument("--news-error-status", type=int, default=503)
+    group.add_argument("--llm-latency-ms", type=float, default=600)
+    group.add_argument("--llm-jitter-ms", type=float, default=200)
+    group.add_argument("--llm-error-rate", type=float, default=0.0)
+    group.add_argument("--llm-error-status", type=int, default=429)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command")
+
+    # Internal: child processes started by the benchmark
+    stubs = sub.add_parser("stubs", help="serve the upstream stubs only")
+    stubs.add_argument("--port", type=int, required=True)
+    add_upstream_arguments(stubs)
+    app = sub.add_parser("app", help="serve the app (optionally on mongomock)")
+    app.add_argument("--port", type=int, required=True)
+    app.add_argument("--mock-mongo", action="store_true")
+
+    parser.add_argument("--routes", nargs="+", choices=ROUTES, default=ROUTES)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10, help="seconds per route and level")
+    parser.add_argument("--requests", type=int, default=0, help="stop a level after this many requests (0: duration only)")
+    parser.add_argument("--warmup", type=int, default=3, help="unmeasured requests per route")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--topics-per-user", type=int, default=3)
+    parser.add_argument("--article-count", type=int, default=10)
+    parser.add_argument("--favorites-per-user", type=int, default=15)
+    parser.add_argument("--login-password", default="password", help="password posted to /login")
+    parser.add_argument("--mongo-uri", default="mock", help='MongoDB URI, or "mock" for mongomock-motor')
+    parser.add_argument("--database", default=f"bench_{int(time.time())}")
+    parser.add_argument("--redis-url", default="", help="Redis for the shared caches (default: in-process only)")
+    parser.add_argument("--ingest", action="store_true", help="run the ingestion worker against the news stub")
+    parser.add_argument("--ingest-wait", type=float, default=5)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="show app and stub output")
+    add_upstream_arguments(parser)
+    args = parser.parse_args()
+
+    if args.command == "stubs":
+        serve_stubs(args)
+        return
+    if args.command == "app":
+        serve_app(args)
+        return
+
+    report = json.dumps(asyncio.run(benchmark(args)), indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: substring topic filtering vs. the precompiled TopicMatcher.
+
+Generates synthetic articles and times both ways of finding which topics
+each article mentions, for topic sets ranging from a single user's interests
+to the union of all subscribed topics seen by the ingestion worker. Also times
+the English check with and without a precompiled regex.
+
+Usage:
+    python benchmarks/bench_topic_matcher.py --articles 5000 --topics 12 50 200
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.utils.topic_matcher import TopicMatcher  # noqa: E402
+
+TOPICS = [
+    "Mobile", "Football", "Space", "Climate", "Chemistry", "Music", "Security",
+    "Food", "Artificial Intelligence", "Elections", "Finance", "Health",
+    "Basketball", "Startups", "Movies", "Travel", "Energy", "Education",
+]
+WORDS = (
+    "the a report says new study shows market update officials announced "
+    "today week city government company launch record growth plan team "
+    "season fans data research scientists players budget market prices "
+    "network release festival weather storm policy court deal"
+).split()
+
+ENGLISH_PATTERN = r"[a-zA-Z0-9\s\.,!?\"'\-:;()/@]+"
+ENGLISH_RE = re.compile(ENGLISH_PATTERN)
+
+
+def make_articles(count: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+
+    def sentence(length: int) -> str:
+        words = [rng.choice(WORDS) for _ in range(length)]
+        # Roughly a third of the articles mention one of the topics
+        if rng.random() < 0.35:
+            words.insert(rng.randrange(len(words)), rng.choice(TOPICS).lower())
+        return " ".join(words).capitalize() + "."
+
+    return [
+        {
+            "title": sentence(10),
+            "description": sentence(30),
+            "content": " ".join(sentence(20) for _ in range(8)),
+        }
+        for _ in range(count)
+    ]
+
+
+def topic_set(size: int, seed: int = 7) -> list[str]:
+    # Real topic names first, then random filler words up to the requested size
+    rng = random.Random(seed)
+    topics = TOPICS[:size]
+    while len(topics) < size:
+        topics.append("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))))
+    return topics
+
+
+def substring_any(articles: list[dict], interests: list[str]) -> list[bool]:
+    # Previous _relevant_to_user: lower-case the article, one `in` scan per topic
+    return [
+        any(t.lower() in f"{a['title']} {a['description']} {a['content']}".lower() for t in interests)
+        for a in articles
+    ]
+
+
+def substring_find(articles: list[dict], interests: list[str]) -> list[list[str]]:
+    # Same approach, reporting every matched topic (needed for per-topic grouping)
+    matched = []
+    for a in articles:
+        combined = f"{a['title']} {a['description']} {a['content']}".lower()
+        matched.append([t for t in interests if t.lower() in combined])
+    return matched
+
+
+def matcher_any(articles: list[dict], interests: list[str]) -> list[bool]:
+    matcher = TopicMatcher(interests)
+    return [matcher.matches(f"{a['title']} {a['description']} {a['content']}") for a in articles]
+
+
+def matcher_find(articles: list[dict], interests: list[str]) -> list[set[str]]:
+    matcher = TopicMatcher(interests)
+    return [matcher.find(f"{a['title']} {a['description']} {a['content']}") for a in articles]
+
+
+def english_uncompiled(articles: list[dict]) -> int:
+    return sum(
+        re.fullmatch(ENGLISH_PATTERN, f"{a['title']} {a['description']}".strip()) is not None
+        for a in articles
+    )
+
+
+def english_compiled(articles: list[dict]) -> int:
+    return sum(
+        ENGLISH_RE.fullmatch(f"{a['title']} {a['description']}".strip()) is not None
+        for a in articles
+    )
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--topics", type=int, nargs="+", default=[8, 50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles)
+    print(f"{args.articles} articles, best of {args.repeat}, times in ms")
+    print(f"{'topics':>7} {'any: substr':>12} {'matcher':>9} {'find: substr':>13} {'matcher':>9} {'speedup':>8}")
+    for size in args.topics:
+        interests = topic_set(size)
+        any_old = best_of(args.repeat, substring_any, articles, interests)
+        any_new = best_of(args.repeat, matcher_any, articles, interests)
+        find_old = best_of(args.repeat, substring_find, articles, interests)
+        find_new = best_of(args.repeat, matcher_find, articles, interests)
+        print(
+            f"{size:>7} {any_old * 1000:>12.1f} {any_new * 1000:>9.1f}"
+            f" {find_old * 1000:>13.1f} {find_new * 1000:>9.1f} {find_old / find_new:>7.1f}x"
+        )
+
+    eng_old = best_of(args.repeat, english_uncompiled, articles)
+    eng_new = best_of(args.repeat, english_compiled, articles)
+    print(f"english check  re.fullmatch: {eng_old * 1000:.1f}  compiled: {eng_new * 1000:.1f}")
+
+
+if __name__ == "__main__":
+    main()
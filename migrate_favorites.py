@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Script to move embedded favorites arrays into the favorites collection.
+
+The application also runs this migration at startup; the script is for
+migrating ahead of a deploy. Safe to run repeatedly.
+"""
+import asyncio
+
+from backend.db.indexes import ensure_indexes
+from backend.db.mongo import client
+from backend.services.favorites_store import migrate_embedded_favorites
+
+async def migrate_favorites():
+    try:
+        # The unique (user_id, url) index must exist before upserting
+        await ensure_indexes()
+        migrated = await migrate_embedded_favorites()
+        print(f"Migrated favorites of {migrated} users")
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(migrate_favorites())
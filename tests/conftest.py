@@ -0,0 +1,8 @@
+# tests/conftest.py
+"""Environment for importing the backend without real services."""
+import os
+
+# Read by backend.core.config at import time; the Motor client connects lazily
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DATABASE_NAME", "test")
+os.environ["REDIS_URL"] = ""
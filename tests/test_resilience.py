@@ -0,0 +1,43 @@
+# tests/test_resilience.py
+"""Upstream breaker and adaptive timeout under caller-side deadlines."""
+import asyncio
+
+from backend.utils import resilience
+from backend.utils.resilience import Upstream
+
+
+def _upstream() -> Upstream:
+    return Upstream("test", min_timeout=0.01, max_timeout=5.0, slow_call_seconds=0.02)
+
+
+async def _hang():
+    await asyncio.sleep(10)
+
+
+def _cut_off(upstream: Upstream, deadline: float) -> None:
+    async def run():
+        try:
+            await asyncio.wait_for(upstream.call(_hang), deadline)
+        except asyncio.TimeoutError:
+            pass
+    asyncio.run(run())
+
+
+def test_calls_cut_off_by_the_caller_open_the_breaker(monkeypatch):
+    monkeypatch.setattr(resilience, "MIN_LATENCY_SAMPLES", 3)
+    upstream = _upstream()
+
+    for _ in range(upstream.breaker.min_calls):
+        _cut_off(upstream, 0.05)
+
+    assert upstream.is_open
+    assert upstream.latency.p95() >= 0.05
+
+
+def test_early_cancellation_records_nothing():
+    upstream = _upstream()
+
+    _cut_off(upstream, 0.001)
+
+    assert not upstream.breaker._outcomes
+    assert upstream.latency.p95() is None
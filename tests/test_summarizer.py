@@ -0,0 +1,86 @@
+# tests/test_summarizer.py
+"""Fallbacks of the summarizer when the LLM cannot be used."""
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from backend.services import llm_gateway as gateway_module
+from backend.services import summarizer
+from backend.utils import resilience
+
+BODY = " ".join(
+    f"Sentence number {i} of the report explains another detail of the new city budget and its effects on schools."
+    for i in range(6)
+)
+
+
+def _article(n: int) -> dict:
+    title = f"City council passes budget {n}"
+    return {"title": title, "text": f"{title}. {BODY}", "description": BODY, "url": f"https://example.com/{n}"}
+
+
+class _RateLimitedCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+        raise openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class _Client:
+    def __init__(self):
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = _RateLimitedCompletions()
+
+
+@pytest.fixture
+def rate_limited(monkeypatch):
+    client = _Client()
+    monkeypatch.setattr(summarizer, "get_openai_client", lambda: client)
+    monkeypatch.setattr(gateway_module, "get_openai_client", lambda: client)
+    # The gateway's retries are already used up
+    monkeypatch.setattr(gateway_module.llm_gateway, "max_retries", 0)
+    monkeypatch.setattr(summarizer, "LOCAL_SUMMARY_ENABLED", True)
+    return client
+
+
+def test_long_article_goes_to_llm_tier(rate_limited):
+    assert summarizer.choose_tier(_article(0)) == summarizer.LLM
+
+
+@pytest.mark.parametrize("batching", [False, True])
+def test_exhausted_rate_limit_falls_back_to_local_summary(rate_limited, batching):
+    items = [_article(1), _article(2)] if batching else [_article(3)]
+
+    summaries = asyncio.run(summarizer.summarize_articles(items, batching=batching))
+
+    assert rate_limited.chat.completions.calls >= 1
+    assert summaries == [summarizer._local_summary(item) for item in items]
+    assert summarizer.SUMMARY_UNAVAILABLE not in summaries
+
+
+def test_missing_api_key_falls_back_to_local_summary(monkeypatch):
+    monkeypatch.setattr(gateway_module, "get_openai_client", lambda: None)
+    monkeypatch.setattr(summarizer, "LOCAL_SUMMARY_ENABLED", True)
+    item = _article(4)
+
+    summary = asyncio.run(summarizer._summarize_single(0, item, "en", "key", asyncio.Semaphore(1), 5.0))
+
+    assert summary == (0, summarizer._local_summary(item))
+
+
+def test_llm_tier_returns_after_breaker_open_seconds(rate_limited, monkeypatch):
+    breaker = gateway_module.llm_upstream.breaker
+    now = resilience.time.monotonic()
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now)
+    monkeypatch.setattr(breaker, "state", resilience.OPEN)
+    monkeypatch.setattr(breaker, "_opened_at", now)
+    assert summarizer.choose_tier(_article(5)) == summarizer.LOCAL
+
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now + breaker.open_seconds + 1)
+
+    assert summarizer.choose_tier(_article(5)) == summarizer.LLM